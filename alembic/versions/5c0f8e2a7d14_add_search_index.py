@@ -0,0 +1,71 @@
+"""add_search_index
+
+Revision ID: 5c0f8e2a7d14
+Revises: b7e4d1a9c2f5
+Create Date: 2026-10-18 15:02:44.120931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c0f8e2a7d14'
+down_revision: Union[str, None] = 'b7e4d1a9c2f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE VIRTUAL TABLE employees_search USING fts5("
+        "name, surname, content='employees', content_rowid='id', tokenize='trigram')"
+    )
+    op.execute(
+        "CREATE TRIGGER employees_search_insert AFTER INSERT ON employees BEGIN "
+        "INSERT INTO employees_search (rowid, name, surname) VALUES (new.id, new.name, new.surname); END"
+    )
+    op.execute(
+        "CREATE TRIGGER employees_search_delete AFTER DELETE ON employees BEGIN "
+        "INSERT INTO employees_search (employees_search, rowid, name, surname) "
+        "VALUES ('delete', old.id, old.name, old.surname); END"
+    )
+    op.execute(
+        "CREATE TRIGGER employees_search_update AFTER UPDATE OF id, name, surname ON employees BEGIN "
+        "INSERT INTO employees_search (employees_search, rowid, name, surname) "
+        "VALUES ('delete', old.id, old.name, old.surname); "
+        "INSERT INTO employees_search (rowid, name, surname) VALUES (new.id, new.name, new.surname); END"
+    )
+    op.execute(
+        "CREATE VIRTUAL TABLE devices_search USING fts5("
+        "name, imei, content='devices', content_rowid='id', tokenize='trigram')"
+    )
+    op.execute(
+        "CREATE TRIGGER devices_search_insert AFTER INSERT ON devices BEGIN "
+        "INSERT INTO devices_search (rowid, name, imei) VALUES (new.id, new.name, new.imei); END"
+    )
+    op.execute(
+        "CREATE TRIGGER devices_search_delete AFTER DELETE ON devices BEGIN "
+        "INSERT INTO devices_search (devices_search, rowid, name, imei) "
+        "VALUES ('delete', old.id, old.name, old.imei); END"
+    )
+    op.execute(
+        "CREATE TRIGGER devices_search_update AFTER UPDATE OF id, name, imei ON devices BEGIN "
+        "INSERT INTO devices_search (devices_search, rowid, name, imei) "
+        "VALUES ('delete', old.id, old.name, old.imei); "
+        "INSERT INTO devices_search (rowid, name, imei) VALUES (new.id, new.name, new.imei); END"
+    )
+
+    # Index the rows written before the search tables existed
+    op.execute("INSERT INTO employees_search (employees_search) VALUES ('rebuild')")
+    op.execute("INSERT INTO devices_search (devices_search) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    for trigger in ("insert", "delete", "update"):
+        op.execute(f"DROP TRIGGER devices_search_{trigger}")
+        op.execute(f"DROP TRIGGER employees_search_{trigger}")
+    op.execute("DROP TABLE devices_search")
+    op.execute("DROP TABLE employees_search")
@@ -4,6 +4,7 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 
 from services import UserService
+from services.principal_cache import principal_cache
 from core.environment import settings
 from exc import raise_with_log
 from models import User
@@ -17,32 +18,52 @@ async def get_current_user(
     token: str = Depends(oauth2_schema)
 ) -> User | None:
     """Decode token to obtain user information.
-    Extracts user information from token and verifies expiration time.
+    Extracts user information from token and verifies expiration and revocation.
     If token is valid then instance of User class is returned, otherwise exception is raised.
+    The user is read from database by the uid claim, so a token of a deleted
+    user, or one issued before the user was last changed, is rejected by
+    every worker; tokens issued without claims are resolved by email.
+    Users resolved from valid tokens are kept in principal_cache, so a
+    worker that did not handle the change notices it within its TTL.
     """
 
     if token is None:
         raise_with_log(status.HTTP_401_UNAUTHORIZED, "Invalid token")
 
+    user = principal_cache.get(token)
+    if user is not None:
+        return user
+
     try:
         payload = jwt.decode(token, settings.TOKEN_KEY, algorithms=[settings.TOKEN_ALGORITHM])
 
         sub: str = payload.get("sub")
         expires_at: str = payload.get("expires_at")
+        user_id: int | None = payload.get("uid")
 
         if sub is None:
             raise_with_log(status.HTTP_401_UNAUTHORIZED, "Invalid credentials")
 
-        if is_expired(expires_at):
+        expires_in = seconds_left(expires_at)
+        if expires_in <= 0:
             raise_with_log(status.HTTP_401_UNAUTHORIZED, "Token expired")
 
-        return await user_service.get_by_email(email=sub)
+        if user_id is None:
+            user = await user_service.get_by_email(email=sub)
+        else:
+            user = await user_service.get_token_user(user_id, payload.get("iat", 0))
+            if user is None:
+                raise_with_log(status.HTTP_401_UNAUTHORIZED, "Token revoked")
+
+        if user is not None:
+            principal_cache.put(token, user, expires_in)
+        return user
 
     except JWTError:
         raise_with_log(status.HTTP_401_UNAUTHORIZED, "Invalid credentials")
 
 
-def is_expired(expires_at: str) -> bool:
-    """Return :obj:`True` if token has expired."""
+def seconds_left(expires_at: str) -> float:
+    """Return number of seconds until token expires."""
 
-    return datetime.strptime(expires_at, "%Y-%m-%d %H:%M:%S") < datetime.utcnow()
+    return (datetime.strptime(expires_at, "%Y-%m-%d %H:%M:%S") - datetime.utcnow()).total_seconds()
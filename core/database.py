@@ -1,22 +1,140 @@
+import time
 from typing import AsyncGenerator
 
+from sqlalchemy import Select, event
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.ext.asyncio import async_sessionmaker
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
-from core.environment import settings
+from core.environment import Settings, settings
+from core.metrics import observe_pool_wait
 
-async_engine = create_async_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False}, echo=True)
 
-async_session = async_sessionmaker(async_engine, expire_on_commit=False)
+def sqlite_pragmas(config: Settings) -> dict:
+    """PRAGMAs applied to every new SQLite connection, empty values are skipped."""
 
+    pragmas = {
+        "journal_mode": config.SQLITE_JOURNAL_MODE,
+        "synchronous": config.SQLITE_SYNCHRONOUS,
+        "mmap_size": config.SQLITE_MMAP_SIZE,
+        "cache_size": config.SQLITE_CACHE_SIZE,
+        "busy_timeout": config.SQLITE_BUSY_TIMEOUT_MS,
+    }
+    return {name: value for name, value in pragmas.items() if value not in ("", None)}
 
-async def get_db_connection() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session() as session:
-        yield session
 
+def is_sqlite_file(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def read_url(config: Settings) -> URL | None:
+    """URL of the engine serving reads, :obj:`None` if reads go to the primary.
+
+    DATABASE_READ_URL points to a replica. Without it a SQLite file is
+    opened a second time in read-only mode.
+    """
+
+    if not config.DATABASE_READ_ROUTING:
+        return
+    if config.DATABASE_READ_URL:
+        return make_url(config.DATABASE_READ_URL)
+
+    url = make_url(config.DATABASE_URL)
+    if is_sqlite_file(url):
+        return url.set(database=f"file:{url.database}", query={**url.query, "mode": "ro", "uri": "true"})
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool reporting how long every checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            observe_pool_wait(time.perf_counter() - started)
+
+
+def create_engine(config: Settings, url: URL | str | None = None) -> AsyncEngine:
+    """Build the engine described by the DATABASE_* and SQLITE_* settings.
+
+    DATABASE_POOL_SIZE=0 opens a new connection for every session.
+    DATABASE_STATEMENT_CACHE_SIZE sizes the prepared statement cache of
+    every SQLite connection.
+    """
+
+    url = make_url(url or config.DATABASE_URL)
+    is_sqlite = url.get_backend_name() == "sqlite"
+    is_memory = is_sqlite and not is_sqlite_file(url)
+
+    options = {"echo": config.DATABASE_ECHO, "pool_pre_ping": config.DATABASE_POOL_PRE_PING}
+    connect_args = {}
+    if is_sqlite:
+        connect_args.update(check_same_thread=False, cached_statements=config.DATABASE_STATEMENT_CACHE_SIZE)
 
+    if not is_memory:
+        if config.DATABASE_POOL_SIZE > 0:
+            options.update(poolclass=InstrumentedQueuePool, pool_size=config.DATABASE_POOL_SIZE,
+                           max_overflow=config.DATABASE_MAX_OVERFLOW)
+        else:
+            options.update(poolclass=NullPool)
 
+    engine = create_async_engine(url, connect_args=connect_args, **options)
 
+    if is_sqlite:
+        pragmas = sqlite_pragmas(config)
+        if url.query.get("mode") == "ro":
+            pragmas.pop("journal_mode", None)
 
+        @event.listens_for(engine.sync_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
 
+    return engine
 
+
+class RoutingSession(Session):
+    """Session sending plain SELECTs to ``info["read_engine"]``.
+
+    Flushes and every other statement go to the session's own bind, and so
+    does every statement after the first write until the transaction ends,
+    so a transaction always reads its own writes. Inside a UnitOfWork every
+    statement goes to the own bind, so checks read what the writes see.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        read_engine = self.info.get("read_engine")
+        if read_engine is None or self.info.get("writing") or self.info.get("unit_of_work_depth"):
+            return super().get_bind(mapper, clause=clause, **kw)
+        if self._flushing or not isinstance(clause, Select):
+            self.info["writing"] = True
+            return super().get_bind(mapper, clause=clause, **kw)
+        return read_engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def stop_writing(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop("writing", None)
+
+
+def create_sessionmaker(engine: AsyncEngine, read_engine: AsyncEngine | None = None) -> async_sessionmaker:
+    return async_sessionmaker(engine, expire_on_commit=False, sync_session_class=RoutingSession,
+                              info={"read_engine": read_engine} if read_engine else None)
+
+
+async_engine = create_engine(settings)
+
+async_read_engine = create_engine(settings, read_url(settings)) if read_url(settings) is not None else None
+
+async_session = create_sessionmaker(async_engine, async_read_engine)
+
+
+async def get_db_connection() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session() as session:
+        yield session
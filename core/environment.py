@@ -11,6 +11,18 @@ class Settings(BaseSettings):
     API_VERSION: str = '1.0.0'
     APP_NAME: str = 'PhysicalAccessControlSystem'
     DATABASE_URL: str
+    DATABASE_READ_ROUTING: bool = True
+    DATABASE_READ_URL: str = ""
+    DATABASE_ECHO: bool = False
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_PRE_PING: bool = False
+    DATABASE_STATEMENT_CACHE_SIZE: int = 256
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64_000
+    SQLITE_BUSY_TIMEOUT_MS: int = 5_000
     DEBUG_MODE: bool
     TOKEN_KEY: str = ""
     AUTH_URL: Final = "token"
@@ -19,6 +31,21 @@ class Settings(BaseSettings):
     TOKEN_ALGORITHM: Final = "HS256"
     FIRST_SUPERUSER: EmailStr = "example@example.com"
     FIRST_SUPERUSER_PASSWORD: str = "12345"
+    EVENT_JOURNAL_ENABLED: bool = True
+    EVENT_JOURNAL_BATCH_SIZE: int = 500
+    EVENT_JOURNAL_FLUSH_INTERVAL_MS: int = 50
+    EVENT_JOURNAL_QUEUE_SIZE: int = 10_000
+    EVENT_JOURNAL_RETRIES: int = 3
+    EVENT_JOURNAL_RETRY_BACKOFF_MS: int = 100
+    DROP_IN_BATCH_MAX_SIZE: int = 10_000
+    EMPLOYEE_IMPORT_CHUNK_SIZE: int = 1_000
+    ACCESS_BULK_MAX_SIZE: int = 10_000
+    EVENT_EXPORT_CHUNK_SIZE: int = 1_000
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60
+    PASSWORD_HASHING_WORKERS: int = 2
+    PASSWORD_HASHING_QUEUE_SIZE: int = 64
+    PASSWORD_HASHING_EXECUTOR: str = "process"
 
     model_config = SettingsConfigDict(
             env_file=Path(__file__).parent.parent / f"{os.getenv('APP_CONFIG_FILE', '')}.env",
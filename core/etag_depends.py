@@ -0,0 +1,34 @@
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Depends, Header, HTTPException, Response, status
+
+from repository import TableVersionRepository
+
+
+def table_etag(table: str) -> Callable[..., Awaitable[str]]:
+    """Dependency emitting the ETag of the table's current version.
+
+    Answers 304 right away when If-None-Match already holds it, so the
+    endpoint's query never runs; the version is read with one primary key
+    lookup instead. It is taken before the query, so a change committed
+    meanwhile can only make the next request miss.
+    Endpoints returning a Response themselves must copy the returned ETag.
+    """
+
+    async def dependency(
+        response: Response,
+        if_none_match: Optional[str] = Header(None),
+        table_versions: TableVersionRepository = Depends(),
+    ) -> str:
+        etag = f'"{table}-{await table_versions.get(table)}"'
+        if if_none_match and matches(if_none_match, etag):
+            raise HTTPException(status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return etag
+
+    return dependency
+
+
+def matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
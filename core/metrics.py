@@ -0,0 +1,174 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Prometheus histogram with a fixed set of label names."""
+
+    def __init__(
+        self, name: str, documentation: str, buckets: Sequence[float], label_names: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts, total = self._series.setdefault(labels, ([0] * (len(self.buckets) + 1), [0.0]))
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def clear(self) -> None:
+        self._series.clear()
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total) in sorted(self._series.items()):
+            pairs = [f'{name}="{escape(value)}"' for name, value in zip(self.label_names, labels)]
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f'{self.name}_bucket{{{",".join((*pairs, le))}}} {cumulative}'
+            suffix = f'{{{",".join(pairs)}}}' if pairs else ""
+            yield f"{self.name}_sum{suffix} {total[0]}"
+            yield f"{self.name}_count{suffix} {cumulative}"
+
+
+class Counter:
+    """Prometheus counter without labels."""
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def clear(self) -> None:
+        self.value = 0
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        yield f"{self.name} {self.value}"
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", LATENCY_BUCKETS, ("method", "route", "status"))
+request_db_statements = Histogram(
+    "http_request_db_statements", "SQL statements executed per HTTP request.", STATEMENT_BUCKETS, ("method", "route"))
+request_db_duration = Histogram(
+    "http_request_db_duration_seconds", "Time spent in SQL statements per HTTP request.", LATENCY_BUCKETS,
+    ("method", "route"))
+pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled database connection.", LATENCY_BUCKETS)
+
+event_journal_dropped = Counter(
+    "event_journal_dropped_events_total", "Door events the event journal failed to write and dropped.")
+
+METRICS = (request_duration, request_db_statements, request_db_duration, pool_checkout_wait, event_journal_dropped)
+
+
+def render() -> str:
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+
+def clear() -> None:
+    for metric in METRICS:
+        metric.clear()
+
+
+class RequestStats:
+    """Database work done while serving one request."""
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    context.statement_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def finish_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - context.statement_started
+    stats = request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time += elapsed
+
+
+def observe_pool_wait(seconds: float) -> None:
+    pool_checkout_wait.observe(seconds)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.pool_wait += seconds
+
+
+class MetricsMiddleware:
+    """Measures every HTTP request.
+
+    Adds a Server-Timing header with the time spent in SQL statements, the
+    number of statements, pool checkout wait and total time, and feeds the
+    per-route histograms rendered by ``render``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", ", ".join((
+                    f'db;dur={stats.db_time * 1000:.3f};desc="{stats.statements} statements"',
+                    f"pool;dur={stats.pool_wait * 1000:.3f}",
+                    f"app;dur={(time.perf_counter() - started) * 1000:.3f}",
+                )))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_stats.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path_format", None) or "<unmatched>"
+            method = scope["method"]
+            request_duration.observe(time.perf_counter() - started, method, path, str(status_code))
+            request_db_statements.observe(stats.statements, method, path)
+            request_db_duration.observe(stats.db_time, method, path)
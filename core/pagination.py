@@ -0,0 +1,79 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from fastapi import status
+from sqlalchemy import Select, tuple_
+
+from exc import raise_with_log
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor pointing after the row with the given sort key values."""
+
+    return base64.urlsafe_b64encode(json.dumps(list(values), default=str).encode()).decode()
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[Any], Any]) -> tuple:
+    """Sort key values of a cursor, each converted by the parser at the same position."""
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError(cursor)
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (ValueError, TypeError):
+        raise_with_log(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
+
+
+def next_page(items: Sequence[Any], page_size: int, cursor: Callable[[Any], str]) -> dict:
+    """Page of at most page_size items out of page_size + 1 fetched ones.
+
+    next_cursor points after the last item of the page and is returned
+    only when there are more items after it.
+    """
+
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = cursor(items[-1])
+    return {'items': items, 'next_cursor': next_cursor}
+
+
+def sort_keys(columns: Dict[str, Any], sort: str) -> Tuple[Tuple[Any, ...], bool]:
+    """Columns to order by for a sort key like "name" or "-name", and whether descending.
+
+    Every sort ends with the "id" column so that the order is total.
+    """
+
+    column = columns.get(sort.lstrip("-"))
+    if column is None:
+        raise_with_log(status.HTTP_400_BAD_REQUEST, f"Invalid sort key: {sort}")
+    keys = (column,) if column is columns["id"] else (column, columns["id"])
+    return keys, sort.startswith("-")
+
+
+def keyset(stmt: Select, columns: Dict[str, Any], sort: str, after: Optional[str] = None) -> Select:
+    """Order stmt by the sort key and keep only rows after the cursor."""
+
+    keys, descending = sort_keys(columns, sort)
+    if after:
+        cursor_sort, *values = decode_cursor(after, str, *(python_type_parser(key) for key in keys))
+        if cursor_sort != sort:
+            raise_with_log(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
+        key, value = (keys[0], values[0]) if len(keys) == 1 else (tuple_(*keys), tuple_(*values))
+        stmt = stmt.where(key < value if descending else key > value)
+    return stmt.order_by(*(key.desc() if descending else key for key in keys))
+
+
+def keyset_cursor(item: Any, columns: Dict[str, Any], sort: str) -> str:
+    """Cursor pointing after item in the given sort order."""
+
+    keys, _ = sort_keys(columns, sort)
+    return encode_cursor([sort, *(getattr(item, key.key) for key in keys)])
+
+
+def python_type_parser(column: Any) -> Callable[[Any], Any]:
+    python_type = column.type.python_type
+    return {date: date.fromisoformat, datetime: datetime.fromisoformat}.get(python_type, python_type)
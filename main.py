@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 
 from fastapi import Request
 from fastapi.encoders import jsonable_encoder
@@ -6,26 +7,52 @@ import uvicorn
 from fastapi import FastAPI
 from starlette.responses import JSONResponse
 from core.environment import settings
+from core.metrics import MetricsMiddleware
 from metadata.tags import Tags
+from services.event_journal import event_journal
+from services.hashing_pool import hashing_pool
+from services.occupancy import load_occupancy
 from routers import (employee_router,
                      department_router,
                      device_router,
                      event_router,
                      auth_router,
-                     user_router)
+                     user_router,
+                     occupancy_router,
+                     attendance_router,
+                     search_router,
+                     metrics_router)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await load_occupancy()
+    hashing_pool.start()
+    if settings.EVENT_JOURNAL_ENABLED:
+        await event_journal.start()
+    yield
+    await event_journal.stop()
+    hashing_pool.shutdown()
 
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.API_VERSION,
     openapi_tags=Tags,
+    lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware)
+
 # Add Routers
 app.include_router(employee_router)
 app.include_router(department_router)
 app.include_router(device_router)
 app.include_router(event_router)
+app.include_router(occupancy_router)
+app.include_router(attendance_router)
+app.include_router(search_router)
+app.include_router(metrics_router)
 app.include_router(user_router)
 app.include_router(auth_router)
 
@@ -15,6 +15,22 @@ Tags = [
         "name": "Event",
         "description": "Contains CRUD operation on Event",
     },
+    {
+        "name": "Occupancy",
+        "description": "Who is inside the site and each department right now",
+    },
+    {
+        "name": "Attendance",
+        "description": "First entry and last exit per employee per day",
+    },
+    {
+        "name": "Search",
+        "description": "Full-text search over employees and devices",
+    },
+    {
+        "name": "Metrics",
+        "description": "Request latency and SQL statistics in Prometheus text format",
+    },
     {
         "name": "Users",
         "description": "Contains CRUD operation on User",
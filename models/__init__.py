@@ -4,4 +4,7 @@ from .employee import Employee
 from .department import Department
 from .event import Event
 from .user import User
-
+from .attendance import Attendance
+from .access_list_change import AccessListChange
+from .table_version import TableVersion
+from .search import employees_search, devices_search
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Column
+from sqlalchemy import ForeignKey, Column, Index
 from sqlalchemy import Table
 from models.base_model import Base
 
@@ -8,6 +8,7 @@ access_control_table = Table(
     Base.metadata,
     Column("employee_id", ForeignKey("employees.id", ondelete='CASCADE'), primary_key=True),
     Column("device_id", ForeignKey("devices.id", ondelete='CASCADE'), primary_key=True),
+    Index('ix_access_control_table_device_id_employee_id', 'device_id', 'employee_id'),
 )
 
 
@@ -0,0 +1,26 @@
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from .base_model import Base
+
+
+class AccessListChange(Base):
+    """One change to the access lists of the devices, version being its place in the log.
+
+    A row with both ids means the card's entry on the device may have changed,
+    without device_id its entries on every device, and without card_id the
+    whole list of the device (it was opened, closed, created or deleted).
+    No foreign keys, so the log outlives the devices and cards it names, and
+    AUTOINCREMENT, so a version is never handed out twice.
+    """
+
+    __tablename__ = 'access_list_changes'
+    __table_args__ = (
+        Index('ix_access_list_changes_device_id_version', 'device_id', 'version'),
+        {'sqlite_autoincrement': True},
+    )
+
+    version: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    device_id: Mapped[int] = mapped_column(nullable=True)
+    card_id: Mapped[int] = mapped_column(nullable=True)
@@ -0,0 +1,18 @@
+from datetime import date, datetime
+from sqlalchemy import ForeignKey, DateTime, Index
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from .base_model import Base
+
+
+class Attendance(Base):
+    __tablename__ = 'attendance'
+    __table_args__ = (
+        Index('ix_attendance_day_employee_id', 'day', 'employee_id'),
+    )
+
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id", ondelete='CASCADE'), primary_key=True)
+    day: Mapped[date] = mapped_column(primary_key=True)
+    first_entry: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    last_exit: Mapped[datetime] = mapped_column(DateTime, nullable=True)
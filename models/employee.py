@@ -1,5 +1,5 @@
 from datetime import date, timedelta
-from sqlalchemy import ForeignKey, CheckConstraint
+from sqlalchemy import ForeignKey, CheckConstraint, Index
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
@@ -12,6 +12,10 @@ class Employee(Base):
     __tablename__ = 'employees'
     __table_args__ = (
         CheckConstraint('card_finish_date >= card_start_date'),
+        Index('ix_employees_name_id', 'name', 'id'),
+        Index('ix_employees_surname_id', 'surname', 'id'),
+        Index('ix_employees_department_id_id', 'department_id', 'id'),
+        Index('ix_employees_card_finish_date_id', 'card_finish_date', 'id'),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
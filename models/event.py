@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import ForeignKey, DateTime
+from sqlalchemy import ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 
@@ -8,6 +8,11 @@ from .base_model import Base
 
 class Event(Base):
     __tablename__ = 'events'
+    __table_args__ = (
+        Index('ix_events_created_date_id', 'created_date', 'id'),
+        Index('ix_events_employee_id_created_date_id', 'employee_id', 'created_date', 'id'),
+        Index('ix_events_device_id_created_date_id', 'device_id', 'created_date', 'id'),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     device_id: Mapped[int] = mapped_column(ForeignKey("devices.id"), nullable=True)
@@ -0,0 +1,67 @@
+"""Full-text indexes of employees and devices.
+
+employees_search and devices_search are external-content FTS5 tables over
+employees and devices, using the trigram tokenizer so any fragment of at
+least three characters matches, not only word prefixes. Triggers keep them
+in sync with their tables. They are not mapped: the statements below run
+after Base.metadata.create_all, and migration 5c0f8e2a7d14 applies the
+same statements to existing databases.
+"""
+from sqlalchemy import DDL, Column, Float, Integer, MetaData, String, Table, event
+
+from .base_model import Base
+
+SEARCH_TABLES = ("employees_search", "devices_search")
+
+CREATE_SEARCH = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS employees_search USING fts5("
+    "name, surname, content='employees', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS employees_search_insert AFTER INSERT ON employees BEGIN "
+    "INSERT INTO employees_search (rowid, name, surname) VALUES (new.id, new.name, new.surname); END",
+    "CREATE TRIGGER IF NOT EXISTS employees_search_delete AFTER DELETE ON employees BEGIN "
+    "INSERT INTO employees_search (employees_search, rowid, name, surname) "
+    "VALUES ('delete', old.id, old.name, old.surname); END",
+    "CREATE TRIGGER IF NOT EXISTS employees_search_update AFTER UPDATE OF id, name, surname ON employees BEGIN "
+    "INSERT INTO employees_search (employees_search, rowid, name, surname) "
+    "VALUES ('delete', old.id, old.name, old.surname); "
+    "INSERT INTO employees_search (rowid, name, surname) VALUES (new.id, new.name, new.surname); END",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS devices_search USING fts5("
+    "name, imei, content='devices', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS devices_search_insert AFTER INSERT ON devices BEGIN "
+    "INSERT INTO devices_search (rowid, name, imei) VALUES (new.id, new.name, new.imei); END",
+    "CREATE TRIGGER IF NOT EXISTS devices_search_delete AFTER DELETE ON devices BEGIN "
+    "INSERT INTO devices_search (devices_search, rowid, name, imei) VALUES ('delete', old.id, old.name, old.imei); END",
+    "CREATE TRIGGER IF NOT EXISTS devices_search_update AFTER UPDATE OF id, name, imei ON devices BEGIN "
+    "INSERT INTO devices_search (devices_search, rowid, name, imei) VALUES ('delete', old.id, old.name, old.imei); "
+    "INSERT INTO devices_search (rowid, name, imei) VALUES (new.id, new.name, new.imei); END",
+)
+
+DROP_SEARCH = tuple(f"DROP TABLE IF EXISTS {table}" for table in SEARCH_TABLES)
+
+for statement in CREATE_SEARCH:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in DROP_SEARCH:
+    event.listen(Base.metadata, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
+
+# Kept out of Base.metadata, so create_all and autogenerate leave them alone
+search_metadata = MetaData()
+
+employees_search = Table(
+    "employees_search",
+    search_metadata,
+    Column("rowid", Integer),
+    Column("rank", Float),
+    Column("employees_search", String),
+    Column("name", String),
+    Column("surname", String),
+)
+
+devices_search = Table(
+    "devices_search",
+    search_metadata,
+    Column("rowid", Integer),
+    Column("rank", Float),
+    Column("devices_search", String),
+    Column("name", String),
+    Column("imei", String),
+)
@@ -0,0 +1,12 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from .base_model import Base
+
+
+class TableVersion(Base):
+    __tablename__ = 'table_versions'
+
+    table_name: Mapped[str] = mapped_column(String(30), primary_key=True)
+    version: Mapped[int] = mapped_column(default=0)
@@ -9,4 +9,6 @@ class User(Base):
     email: Mapped[str] = mapped_column(unique=True)
     hashed_password: Mapped[str] = mapped_column(nullable=False)
     is_superuser: Mapped[bool] = mapped_column(default=False)
+    # Tokens issued up to this moment (epoch seconds) are rejected
+    tokens_valid_after: Mapped[float] = mapped_column(default=0, server_default="0")
 
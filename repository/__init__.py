@@ -3,3 +3,6 @@ from .device_repository import DeviceRepository
 from .employee_repository import EmployeeRepository
 from .event_repository import EventRepository
 from .user_repository import UserRepository
+from .attendance_repository import AttendanceRepository
+from .search_repository import SearchRepository
+from .table_version_repository import TableVersionRepository
@@ -0,0 +1,105 @@
+from datetime import date, datetime
+from typing import Optional, Sequence, Tuple
+
+from fastapi import Depends
+from sqlalchemy import select, delete, insert, func, case, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db_connection
+from models import Attendance, Device, Event
+from repository.repository_meta import RepositoryMeta
+
+
+class AttendanceRepository(RepositoryMeta):
+    session: AsyncSession
+
+    def __init__(
+        self, session: AsyncSession = Depends(get_db_connection)
+    ) -> None:
+        self.session = session
+
+    async def list(
+        self,
+        limit: int,
+        after: Optional[Tuple[date, int]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        employee_id: Optional[int] = None,
+    ) -> Sequence[Attendance]:
+        """Rollups ordered by (day, employee_id), starting after the given key."""
+
+        stmt = select(Attendance).order_by(Attendance.day, Attendance.employee_id).limit(limit)
+        if after:
+            stmt = stmt.where(tuple_(Attendance.day, Attendance.employee_id) > tuple_(*after))
+        if date_from:
+            stmt = stmt.where(Attendance.day >= date_from)
+        if date_to:
+            stmt = stmt.where(Attendance.day <= date_to)
+        if employee_id is not None:
+            stmt = stmt.where(Attendance.employee_id == employee_id)
+
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def record(self, events: Sequence[Event]) -> None:
+        """Fold successful events into the rollups without committing.
+
+        Entries through "enter" readers move first_entry earlier, entries
+        through "exit" readers move last_exit later.
+        """
+
+        events = [event for event in events if event.success and event.employee_id and event.device_id]
+        if not events:
+            return
+
+        result = await self.session.execute(
+            select(Device.id, Device.route).where(Device.id.in_({event.device_id for event in events})))
+        routes = dict(result.all())
+
+        rows = {}
+        for event in events:
+            route = routes.get(event.device_id)
+            row = rows.setdefault((event.employee_id, event.created_date.date()), {
+                "employee_id": event.employee_id,
+                "day": event.created_date.date(),
+                "first_entry": None,
+                "last_exit": None,
+            })
+            if route == "enter" and (row["first_entry"] is None or event.created_date < row["first_entry"]):
+                row["first_entry"] = event.created_date
+            if route == "exit" and (row["last_exit"] is None or event.created_date > row["last_exit"]):
+                row["last_exit"] = event.created_date
+
+        stmt = sqlite_insert(Attendance)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Attendance.employee_id, Attendance.day],
+            set_={
+                "first_entry": func.coalesce(func.min(Attendance.first_entry, stmt.excluded.first_entry),
+                                             Attendance.first_entry, stmt.excluded.first_entry),
+                "last_exit": func.coalesce(func.max(Attendance.last_exit, stmt.excluded.last_exit),
+                                           Attendance.last_exit, stmt.excluded.last_exit),
+            },
+        )
+        await self.session.execute(stmt, list(rows.values()))
+
+    async def rebuild(self, date_from: date, date_to: date) -> None:
+        """Recompute the rollups of the given days from the events table."""
+
+        day = func.date(Event.created_date)
+        start, end = datetime.combine(date_from, datetime.min.time()), datetime.combine(date_to, datetime.max.time())
+
+        await self.session.execute(delete(Attendance).where(Attendance.day.between(date_from, date_to)))
+        await self.session.execute(insert(Attendance).from_select(
+            ["employee_id", "day", "first_entry", "last_exit"],
+            select(
+                Event.employee_id,
+                day,
+                func.min(case((Device.route == "enter", Event.created_date))),
+                func.max(case((Device.route == "exit", Event.created_date))),
+            )
+            .join(Device, Device.id == Event.device_id)
+            .where(Event.success, Event.employee_id.is_not(None), Event.created_date.between(start, end))
+            .group_by(Event.employee_id, day)
+        ))
+        await self.session.flush()
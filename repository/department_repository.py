@@ -1,14 +1,16 @@
-from typing import Optional, Sequence
+from typing import Collection, Optional, Sequence, Set
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import select, Row, Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from repository.repository_meta import RepositoryMeta
 from core.database import get_db_connection
+from core.pagination import keyset
 from models import Department
 
 
 class DepartmentRepository(RepositoryMeta):
     session: AsyncSession
+    sort_columns = {"id": Department.id, "name": Department.name}
 
     def __init__(
         self, session: AsyncSession = Depends(get_db_connection)
@@ -16,21 +18,45 @@ class DepartmentRepository(RepositoryMeta):
         self.session = session
 
     async def list(
-        self, limit: Optional[int], start: Optional[int],
-    ) -> Sequence[Department]:
-        result = await self.session.execute(select(Department).limit(limit).offset(start))
-        return result.scalars().all()
+        self, limit: Optional[int], start: Optional[int], fields: Optional[Sequence[str]] = None,
+    ) -> Sequence[Department | Row]:
+        """Departments, or rows of only the named columns when fields are given."""
+
+        result = await self.session.execute(self._select(fields).limit(limit).offset(start))
+        return result.all() if fields else result.scalars().all()
+
+    async def list_after(
+        self, limit: int, after: Optional[str] = None, sort: str = "id", fields: Optional[Sequence[str]] = None,
+    ) -> Sequence[Department | Row]:
+        """Departments in sort order, starting after the cursor. See list for fields."""
+
+        result = await self.session.execute(keyset(self._select(fields), self.sort_columns, sort, after).limit(limit))
+        return result.all() if fields else result.scalars().all()
+
+    @staticmethod
+    def _select(fields: Optional[Sequence[str]]) -> Select:
+        if fields:
+            return select(*(getattr(Department, field) for field in fields))
+        return select(Department)
 
     async def get(
         self, department_id: int
     ) -> Department | None:
         return await self.session.get(Department, department_id)
 
+    async def get_existing_ids(
+        self, department_ids: Collection[int]
+    ) -> Set[int]:
+        """The subset of department_ids that belong to existing departments."""
+
+        result = await self.session.execute(select(Department.id).where(Department.id.in_(department_ids)))
+        return set(result.scalars())
+
     async def create(
         self, department: Department
     ) -> Department:
         self.session.add(department)
-        await self.session.commit()
+        await self.session.flush()
         await self.session.refresh(department)
         return department
 
@@ -38,12 +64,12 @@ class DepartmentRepository(RepositoryMeta):
         self, department: Department
     ) -> Department:
         await self.session.merge(department)
-        await self.session.commit()
+        await self.session.flush()
         return department
 
     async def delete(
         self, department: Department
     ) -> None:
         await self.session.delete(department)
-        await self.session.commit()
+        await self.session.flush()
 
@@ -1,15 +1,17 @@
-from typing import Optional, Sequence, Tuple
+from typing import Collection, Optional, Sequence, Set, Tuple
 from fastapi import Depends
-from sqlalchemy import select, Row
+from sqlalchemy import and_, func, insert, or_, select, ColumnElement, Row, Select
 from sqlalchemy.orm import load_only
 from sqlalchemy.ext.asyncio import AsyncSession
 from repository.repository_meta import RepositoryMeta
 from core.database import get_db_connection
-from models import Device
+from core.pagination import keyset
+from models import Device, Employee, AccessListChange, access_control_table
 
 
 class DeviceRepository(RepositoryMeta):
     session: AsyncSession
+    sort_columns = {"id": Device.id, "name": Device.name, "imei": Device.imei}
 
     def __init__(
         self, session: AsyncSession = Depends(get_db_connection)
@@ -17,10 +19,26 @@ class DeviceRepository(RepositoryMeta):
         self.session = session
 
     async def list(
-        self, limit: Optional[int], start: Optional[int],
-    ) -> Sequence[Device]:
-        result = await self.session.execute(select(Device).limit(limit).offset(start))
-        return result.scalars().all()
+        self, limit: Optional[int], start: Optional[int], fields: Optional[Sequence[str]] = None,
+    ) -> Sequence[Device | Row]:
+        """Devices, or rows of only the named columns when fields are given."""
+
+        result = await self.session.execute(self._select(fields).limit(limit).offset(start))
+        return result.all() if fields else result.scalars().all()
+
+    async def list_after(
+        self, limit: int, after: Optional[str] = None, sort: str = "id", fields: Optional[Sequence[str]] = None,
+    ) -> Sequence[Device | Row]:
+        """Devices in sort order, starting after the cursor. See list for fields."""
+
+        result = await self.session.execute(keyset(self._select(fields), self.sort_columns, sort, after).limit(limit))
+        return result.all() if fields else result.scalars().all()
+
+    @staticmethod
+    def _select(fields: Optional[Sequence[str]]) -> Select:
+        if fields:
+            return select(*(getattr(Device, field) for field in fields))
+        return select(Device)
 
     async def get(self, device_id: int, bound_employees=False) -> Device | None:
         result = await self.session.get(Device, device_id)
@@ -30,18 +48,18 @@ class DeviceRepository(RepositoryMeta):
 
     async def create(self, device: Device) -> Device:
         self.session.add(device)
-        await self.session.commit()
+        await self.session.flush()
         await self.session.refresh(device)
         return device
 
     async def update(self, device: Device) -> Device:
         self.session.add(device)
-        await self.session.commit()
+        await self.session.flush()
         return device
 
     async def delete(self, device: Device) -> None:
         await self.session.delete(device)
-        await self.session.commit()
+        await self.session.flush()
 
     async def get_device_id_and_device_opened(self, imei: str) -> Row[Tuple[int, str]] | None:
         stmt = select(Device).options(load_only(Device.opened)
@@ -49,4 +67,59 @@ class DeviceRepository(RepositoryMeta):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_by_imeis(self, imeis: Collection[str]) -> Sequence[Row]:
+        """Id, imei, opened flag, department and route of every device with one of the imeis."""
+
+        result = await self.session.execute(
+            select(Device.id, Device.imei, Device.opened, Device.department_id, Device.route)
+            .where(Device.imei.in_(imeis)))
+        return result.all()
+
+    async def get_access_list_version(self) -> int:
+        """Version of the last change logged in access_list_changes, 0 before the first."""
+
+        result = await self.session.execute(select(func.coalesce(func.max(AccessListChange.version), 0)))
+        return result.scalar_one()
+
+    async def get_access_list_changes(self, device_id: int, since: int) -> Tuple[bool, Set[int]]:
+        """Whether the whole list of the device changed after version since, and the cards whose entries did."""
+
+        result = await self.session.execute(
+            select(AccessListChange.device_id, AccessListChange.card_id)
+            .where(self._changed_since(device_id, since)))
+        reset, card_ids = False, set()
+        for changed_device_id, card_id in result:
+            if card_id is None:
+                reset = True
+            else:
+                card_ids.add(card_id)
+        return reset, card_ids
+
+    async def get_access_list(
+        self, device_id: int, opened: bool, since: Optional[int] = None
+    ) -> Sequence[Row]:
+        """Card and validity window of every employee allowed on the device, ordered by card_id.
+
+        An opened device allows every employee. With since, only the cards
+        logged in access_list_changes after that version are looked at.
+        """
+
+        stmt = select(Employee.card_id, Employee.card_start_date, Employee.card_finish_date).order_by(Employee.card_id)
+        if not opened:
+            stmt = stmt.where(Employee.id.in_(
+                select(access_control_table.c.employee_id).where(access_control_table.c.device_id == device_id)))
+        if since is not None:
+            stmt = stmt.where(Employee.card_id.in_(
+                select(AccessListChange.card_id).where(self._changed_since(device_id, since))))
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    @staticmethod
+    def _changed_since(device_id: int, since: int) -> ColumnElement[bool]:
+        return and_(or_(AccessListChange.device_id == device_id, AccessListChange.device_id.is_(None)),
+                    AccessListChange.version > since)
+
+    async def record_access_list_reset(self, device_id: int) -> None:
+        """Log that the whole access list of the device changed."""
 
+        await self.session.execute(insert(AccessListChange).values(device_id=device_id, card_id=None))
@@ -1,15 +1,24 @@
-from typing import Optional, Sequence
+from typing import Any, Collection, Dict, Optional, Sequence, Set, Tuple
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, exists, Row, ColumnElement, Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from core.database import get_db_connection
+from core.pagination import keyset
 from repository.repository_meta import RepositoryMeta
-from models import Employee
+from models import Employee, Device, AccessListChange, access_control_table
+from schemas.employee_schema import EmployeeFilterSchema
 
 
 class EmployeeRepository(RepositoryMeta):
     session: AsyncSession
+    sort_columns = {
+        "id": Employee.id,
+        "name": Employee.name,
+        "surname": Employee.surname,
+        "card_id": Employee.card_id,
+        "card_finish_date": Employee.card_finish_date,
+    }
 
     def __init__(
         self, session: AsyncSession = Depends(get_db_connection)
@@ -17,10 +26,51 @@ class EmployeeRepository(RepositoryMeta):
         self.session = session
 
     async def list(
-        self, limit: Optional[int], start: Optional[int],
-    ) -> Sequence[Employee]:
-        result = await self.session.execute(select(Employee).limit(limit).offset(start))
-        return result.scalars().all()
+        self, limit: Optional[int], start: Optional[int], fields: Optional[Sequence[str]] = None,
+        filters: Optional[EmployeeFilterSchema] = None,
+    ) -> Sequence[Employee | Row]:
+        """Employees matching the filters, or rows of only the named columns when fields are given."""
+
+        stmt = self._filter(self._select(fields), filters)
+        result = await self.session.execute(stmt.limit(limit).offset(start))
+        return result.all() if fields else result.scalars().all()
+
+    async def list_after(
+        self, limit: int, after: Optional[str] = None, sort: str = "id", fields: Optional[Sequence[str]] = None,
+        filters: Optional[EmployeeFilterSchema] = None,
+    ) -> Sequence[Employee | Row]:
+        """Employees in sort order, starting after the cursor. See list for fields and filters."""
+
+        stmt = self._filter(self._select(fields), filters)
+        result = await self.session.execute(keyset(stmt, self.sort_columns, sort, after).limit(limit))
+        return result.all() if fields else result.scalars().all()
+
+    @staticmethod
+    def _select(fields: Optional[Sequence[str]]) -> Select:
+        if fields:
+            return select(*(getattr(Employee, field) for field in fields))
+        return select(Employee)
+
+    @staticmethod
+    def _filter(stmt: Select, filters: Optional[EmployeeFilterSchema]) -> Select:
+        """Every filter is a range or equality predicate served by an index of employees or access_control_table."""
+
+        if filters is None:
+            return stmt
+        for column, prefix in ((Employee.name, filters.name_prefix), (Employee.surname, filters.surname_prefix)):
+            if prefix:
+                stmt = stmt.where(column >= prefix, column < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+        if filters.department_id is not None:
+            stmt = stmt.where(Employee.department_id == filters.department_id)
+        if filters.card_expires_from:
+            stmt = stmt.where(Employee.card_finish_date >= filters.card_expires_from)
+        if filters.card_expires_to:
+            stmt = stmt.where(Employee.card_finish_date <= filters.card_expires_to)
+        if filters.device_id is not None:
+            stmt = stmt.where(Employee.id.in_(
+                select(access_control_table.c.employee_id)
+                .where(access_control_table.c.device_id == filters.device_id)))
+        return stmt
 
     async def get(
             self, employee_id: int, bound_devices=False
@@ -34,25 +84,148 @@ class EmployeeRepository(RepositoryMeta):
         self, employee: Employee
     ) -> Employee:
         self.session.add(employee)
-        await self.session.commit()
+        await self.session.flush()
         await self.session.refresh(employee)
         return employee
 
+    async def create_many(
+        self, employees: Sequence[Dict[str, Any]]
+    ) -> None:
+        """Insert employees given as column values with one executemany statement."""
+
+        await self.session.execute(insert(Employee), employees)
+        await self.session.flush()
+
     async def update(
         self, employee: Employee
     ) -> Employee:
         self.session.add(employee)
-        await self.session.commit()
+        await self.session.flush()
         return employee
 
     async def delete(
         self, employee: Employee
     ) -> None:
         await self.session.delete(employee)
-        await self.session.commit()
+        await self.session.flush()
 
     async def get_by_card_id(self, card_id: int) -> Employee:
         result = await self.session.execute(
             select(Employee).where(Employee.card_id == card_id).options(selectinload(Employee.devices)))
         return result.scalar_one_or_none()
 
+    async def get_access_decision(self, card_id: int, imei: str) -> Row | None:
+        """Everything needed to decide whether card may pass through device, in one statement.
+
+        Returns None for an unknown card; device_id is None for an unknown imei.
+        """
+
+        allowed = exists().where(
+            access_control_table.c.employee_id == Employee.id,
+            access_control_table.c.device_id == Device.id,
+        )
+        stmt = (
+            select(
+                Employee.id.label("employee_id"),
+                Employee.card_start_date,
+                Employee.card_finish_date,
+                Device.id.label("device_id"),
+                Device.opened,
+                Device.department_id,
+                Device.route,
+                allowed.label("allowed"),
+            )
+            .select_from(Employee)
+            .outerjoin(Device, Device.imei == imei)
+            .where(Employee.card_id == card_id)
+        )
+        result = await self.session.execute(stmt)
+        return result.one_or_none()
+
+    async def get_by_card_ids(self, card_ids: Collection[int]) -> Sequence[Row]:
+        """Id, card_id and card validity window of every employee holding one of the cards."""
+
+        result = await self.session.execute(
+            select(Employee.id, Employee.card_id, Employee.card_start_date, Employee.card_finish_date)
+            .where(Employee.card_id.in_(card_ids)))
+        return result.all()
+
+    async def get_access_pairs(
+        self, employee_ids: Collection[int], device_ids: Collection[int]
+    ) -> Set[Tuple[int, int]]:
+        """(employee_id, device_id) records of access_control_table among the given ids."""
+
+        result = await self.session.execute(
+            select(access_control_table.c.employee_id, access_control_table.c.device_id)
+            .where(access_control_table.c.employee_id.in_(employee_ids),
+                   access_control_table.c.device_id.in_(device_ids)))
+        return {(employee_id, device_id) for employee_id, device_id in result}
+
+    async def grant_access(
+        self, device_ids: Collection[int], employee_ids: Collection[int] = (), department_id: Optional[int] = None
+    ) -> Set[Tuple[int, int]]:
+        """Give the employees (or every employee of the department) access to the devices.
+
+        One INSERT ... SELECT over the existing employees and devices, skipping
+        records that are already there, preceded by another logging them in
+        access_list_changes. Returns the (employee_id, device_id) records it created.
+        """
+
+        pairs = (
+            select(Employee.id.label("employee_id"), Device.id.label("device_id"), Employee.card_id)
+            .join(Device, Device.id.in_(device_ids))
+            .where(self._access_employees(employee_ids, department_id))
+            .where(~exists().where(
+                access_control_table.c.employee_id == Employee.id,
+                access_control_table.c.device_id == Device.id,
+            ))
+            .subquery()
+        )
+        await self.session.execute(
+            insert(AccessListChange)
+            .from_select(["device_id", "card_id"], select(pairs.c.device_id, pairs.c.card_id)))
+        result = await self.session.execute(
+            insert(access_control_table)
+            .from_select(["employee_id", "device_id"], select(pairs.c.employee_id, pairs.c.device_id))
+            .returning(access_control_table.c.employee_id, access_control_table.c.device_id))
+        granted = {(employee_id, device_id) for employee_id, device_id in result}
+        await self.session.flush()
+        return granted
+
+    async def revoke_access(
+        self, device_ids: Collection[int], employee_ids: Collection[int] = (), department_id: Optional[int] = None
+    ) -> Set[Tuple[int, int]]:
+        """Take the devices away from the employees (or every employee of the department) with one DELETE.
+
+        The records are logged in access_list_changes first. Returns the
+        (employee_id, device_id) records it removed.
+        """
+
+        employees = select(Employee.id).where(self._access_employees(employee_ids, department_id))
+        await self.session.execute(
+            insert(AccessListChange)
+            .from_select(["device_id", "card_id"], select(access_control_table.c.device_id, Employee.card_id)
+                         .join(Employee, Employee.id == access_control_table.c.employee_id)
+                         .where(access_control_table.c.device_id.in_(device_ids),
+                                self._access_employees(employee_ids, department_id))))
+        result = await self.session.execute(
+            delete(access_control_table)
+            .where(access_control_table.c.device_id.in_(device_ids),
+                   access_control_table.c.employee_id.in_(employees))
+            .returning(access_control_table.c.employee_id, access_control_table.c.device_id))
+        revoked = {(employee_id, device_id) for employee_id, device_id in result}
+        await self.session.flush()
+        return revoked
+
+    async def record_card_changes(self, card_ids: Collection[int]) -> None:
+        """Log that the entries of the cards may have changed on every device."""
+
+        if card_ids:
+            await self.session.execute(
+                insert(AccessListChange), [{"device_id": None, "card_id": card_id} for card_id in card_ids])
+
+    @staticmethod
+    def _access_employees(employee_ids: Collection[int], department_id: Optional[int]) -> ColumnElement[bool]:
+        if department_id is not None:
+            return Employee.department_id == department_id
+        return Employee.id.in_(employee_ids)
@@ -1,9 +1,14 @@
+from datetime import datetime
+from typing import AsyncIterator, Optional, Sequence, Tuple
+
 from repository.repository_meta import RepositoryMeta
 from fastapi import Depends
+from sqlalchemy import func, insert, select, tuple_, Row, Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_db_connection
-from models import Event
+from models import Device, Employee, Event
+from repository.attendance_repository import AttendanceRepository
 
 
 class EventRepository(RepositoryMeta):
@@ -18,6 +23,104 @@ class EventRepository(RepositoryMeta):
         self, event: Event
     ) -> None:
         self.session.add(event)
-        await self.session.commit()
+        await AttendanceRepository(self.session).record([event])
+        await self.session.flush()
+
+    async def create_many(
+        self, events: Sequence[Event]
+    ) -> None:
+        """Write events with one multi-row insert in a single transaction, together with their rollups."""
+
+        await self.session.execute(insert(Event), [
+            {
+                "device_id": event.device_id,
+                "employee_id": event.employee_id,
+                "created_date": event.created_date,
+                "success": event.success,
+            } for event in events
+        ])
+        await AttendanceRepository(self.session).record(events)
+        await self.session.flush()
+
+    async def history(
+        self,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+        employee_id: Optional[int] = None,
+        device_id: Optional[int] = None,
+        success: Optional[bool] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> Sequence[Event]:
+        """Events ordered by (created_date, id), starting after the given key."""
+
+        stmt = select(Event).order_by(Event.created_date, Event.id).limit(limit)
+        if after:
+            stmt = stmt.where(tuple_(Event.created_date, Event.id) > tuple_(*after))
+        stmt = self._filter(stmt, employee_id, device_id, success, date_from, date_to)
+
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def stream(
+        self,
+        chunk_size: int,
+        employee_id: Optional[int] = None,
+        device_id: Optional[int] = None,
+        success: Optional[bool] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Event rows ordered by (created_date, id) in chunks of chunk_size, read from a server-side cursor.
+
+        Only chunk_size rows are held at a time, however many the range covers.
+        """
+
+        stmt = select(Event.id, Event.device_id, Event.employee_id, Event.created_date, Event.success)
+        stmt = self._filter(stmt.order_by(Event.created_date, Event.id),
+                            employee_id, device_id, success, date_from, date_to)
+
+        result = await self.session.stream(stmt.execution_options(yield_per=chunk_size))
+        try:
+            async for rows in result.partitions():
+                yield rows
+        finally:
+            await result.close()
+
+    async def get_last_swipes(self) -> Sequence[Row]:
+        """(employee_id, department_id, route, created_date) of each employee's latest successful swipe per department.
+
+        One grouped query; SQLite takes the bare route column from the row holding max(created_date).
+        """
+
+        result = await self.session.execute(
+            select(Event.employee_id, Device.department_id, Device.route, func.max(Event.created_date))
+            .join(Device, Device.id == Event.device_id)
+            .join(Employee, Employee.id == Event.employee_id)
+            .where(Event.success)
+            .group_by(Event.employee_id, Device.department_id))
+        return result.all()
 
+    @staticmethod
+    def _filter(
+        stmt: Select,
+        employee_id: Optional[int],
+        device_id: Optional[int],
+        success: Optional[bool],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+    ) -> Select:
+        if employee_id is not None:
+            stmt = stmt.where(Event.employee_id == employee_id)
+        if device_id is not None:
+            stmt = stmt.where(Event.device_id == device_id)
+        if success is not None:
+            stmt = stmt.where(Event.success == success)
+        if date_from:
+            stmt = stmt.where(Event.created_date >= date_from)
+        if date_to:
+            stmt = stmt.where(Event.created_date < date_to)
+        return stmt
 
+    async def release(self) -> None:
+        await self.session.close()
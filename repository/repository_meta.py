@@ -1,6 +1,10 @@
 from abc import abstractmethod
 from typing import Generic, List, TypeVar
 
+from core.pagination import keyset_cursor
+from repository.table_version_repository import TableVersionRepository
+from repository.unit_of_work import UnitOfWork
+
 # Type definition for Model
 M = TypeVar("M")
 
@@ -12,6 +16,9 @@ K = TypeVar("K")
 #################################
 class RepositoryMeta(Generic[M, K]):
 
+    # Columns lists can be sorted by, "id" must be one of them
+    sort_columns: dict = {}
+
     # Create a new instance of the Model
     @abstractmethod
     def create(self, instance: M) -> M:
@@ -35,4 +42,16 @@ class RepositoryMeta(Generic[M, K]):
     # Updates an existing instance of the Model
     @abstractmethod
     def update(self, instance: M) -> M:
-        pass
\ No newline at end of file
+        pass
+
+    # Transaction around a service call, see UnitOfWork
+    def unit_of_work(self) -> UnitOfWork:
+        return UnitOfWork(self.session)
+
+    # Mark the table changed in the transaction of the change, see TableVersionRepository
+    async def bump_version(self, table: str) -> None:
+        await TableVersionRepository(self.session).bump(table)
+
+    # Opaque cursor pointing after the instance in the given sort order
+    def cursor(self, instance: M, sort: str = "id") -> str:
+        return keyset_cursor(instance, self.sort_columns, sort)
@@ -0,0 +1,53 @@
+from typing import Sequence
+
+from fastapi import Depends
+from sqlalchemy import func, select, literal, null, union_all, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db_connection
+from models import Device, Employee, employees_search, devices_search
+from repository.repository_meta import RepositoryMeta
+
+
+class SearchRepository(RepositoryMeta):
+    session: AsyncSession
+
+    def __init__(
+        self, session: AsyncSession = Depends(get_db_connection)
+    ) -> None:
+        self.session = session
+
+    async def search(self, query: str, limit: int) -> Sequence[Row]:
+        """Employees and devices matching the FTS5 query, best match first.
+
+        bm25 scores of the two FTS5 tables come from their own document
+        counts and lengths, so they are not comparable. Each kind is scored
+        relative to its own best match instead (1 for the best, towards 0
+        for worse ones; bm25 is negative, better is lower), and the kinds
+        are merged on that score.
+        """
+
+        employees = (
+            select(literal("employee").label("kind"), Employee.id,
+                   (Employee.name + " " + Employee.surname).label("title"), null().label("detail"),
+                   self._relative(employees_search.c.rank))
+            .select_from(employees_search)
+            .join(Employee, Employee.id == employees_search.c.rowid)
+            .where(employees_search.c.employees_search.op("MATCH")(query))
+        )
+        devices = (
+            select(literal("device").label("kind"), Device.id, Device.name.label("title"),
+                   Device.imei.label("detail"), self._relative(devices_search.c.rank))
+            .select_from(devices_search)
+            .join(Device, Device.id == devices_search.c.rowid)
+            .where(devices_search.c.devices_search.op("MATCH")(query))
+        )
+        found = union_all(employees, devices).subquery()
+
+        result = await self.session.execute(
+            select(found).order_by(found.c.score.desc(), found.c.kind, found.c.id).limit(limit))
+        return result.all()
+
+    @staticmethod
+    def _relative(rank):
+        return func.coalesce(rank / func.nullif(func.min(rank).over(), 0), 1).label("score")
@@ -0,0 +1,31 @@
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db_connection
+from models import TableVersion
+
+
+class TableVersionRepository:
+    """Version of each admin table, the source of the ETags of its list and get endpoints.
+
+    Versions are bumped in the transaction of the change, so every worker
+    sees them as soon as the change is committed.
+    """
+
+    session: AsyncSession
+
+    def __init__(
+        self, session: AsyncSession = Depends(get_db_connection)
+    ) -> None:
+        self.session = session
+
+    async def get(self, table: str) -> int:
+        result = await self.session.execute(select(TableVersion.version).where(TableVersion.table_name == table))
+        return result.scalar_one_or_none() or 0
+
+    async def bump(self, table: str) -> None:
+        stmt = insert(TableVersion).values(table_name=table, version=1)
+        await self.session.execute(stmt.on_conflict_do_update(
+            index_elements=[TableVersion.table_name], set_={"version": TableVersion.version + 1}))
@@ -0,0 +1,26 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UnitOfWork:
+    """Transaction spanning a whole service call.
+
+    Repositories only flush; the outermost unit of work on a session
+    commits once when its block ends, or rolls back if the block raised.
+    Nested units of work join the outer one.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self.session.info["unit_of_work_depth"] = self.session.info.get("unit_of_work_depth", 0) + 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        depth = self.session.info["unit_of_work_depth"] = self.session.info["unit_of_work_depth"] - 1
+        if depth:
+            return
+        if exc_type is None:
+            await self.session.commit()
+        else:
+            await self.session.rollback()
@@ -4,12 +4,14 @@ from fastapi import Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.database import get_db_connection
+from core.pagination import keyset
 from models import User
 from repository.repository_meta import RepositoryMeta
 
 
 class UserRepository(RepositoryMeta):
     session: AsyncSession
+    sort_columns = {"id": User.id, "email": User.email}
 
     def __init__(
             self, session: AsyncSession = Depends(get_db_connection)
@@ -19,7 +21,7 @@ class UserRepository(RepositoryMeta):
     async def create(self, user: User) -> User:
         """Write user to database."""
         self.session.add(user)
-        await self.session.commit()
+        await self.session.flush()
         await self.session.refresh(user)
         return user
 
@@ -32,14 +34,14 @@ class UserRepository(RepositoryMeta):
         self, user: User
     ) -> User:
         self.session.add(user)
-        await self.session.commit()
+        await self.session.flush()
         return user
 
     async def delete(
         self, user: User
     ) -> None:
         await self.session.delete(user)
-        await self.session.commit()
+        await self.session.flush()
 
     async def get(
             self, user_id: int
@@ -51,3 +53,11 @@ class UserRepository(RepositoryMeta):
     ) -> Sequence[User]:
         result = await self.session.execute(select(User).limit(limit).offset(start))
         return result.scalars().all()
+
+    async def list_after(
+        self, limit: int, after: Optional[str] = None, sort: str = "id",
+    ) -> Sequence[User]:
+        """Users in sort order, starting after the cursor."""
+
+        result = await self.session.execute(keyset(select(User), self.sort_columns, sort, after).limit(limit))
+        return result.scalars().all()
@@ -4,4 +4,7 @@ from .device_router import device_router
 from .event_router import event_router
 from .user_router import user_router
 from .auth_router import auth_router
-
+from .occupancy_router import occupancy_router
+from .attendance_router import attendance_router
+from .metrics_router import metrics_router
+from .search_router import search_router
@@ -0,0 +1,34 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from starlette import status
+
+from services import AttendanceService
+from core.current_user_depends import get_current_user
+from schemas.attendance_schema import AttendancePageSchema
+
+
+attendance_router = APIRouter(
+    prefix="/attendance", tags=["Attendance"], dependencies=[Depends(get_current_user)]
+)
+
+
+@attendance_router.get("", response_model=AttendancePageSchema)
+async def get_attendance(
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        employee_id: Optional[int] = None,
+        page_size: int = Query(100, ge=1, le=1000),
+        after: Optional[str] = None,
+        attendance_service: AttendanceService = Depends()
+):
+    return await attendance_service.list(page_size, after, date_from, date_to, employee_id)
+
+
+@attendance_router.post("/rebuild", status_code=status.HTTP_204_NO_CONTENT)
+async def rebuild_attendance(
+        date_from: date,
+        date_to: date,
+        attendance_service: AttendanceService = Depends()
+):
+    await attendance_service.rebuild(date_from, date_to)
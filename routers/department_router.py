@@ -1,9 +1,10 @@
 from typing import Optional, List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from starlette import status
 
 from services import DepartmentService
 from core.current_user_depends import get_current_user
+from core.etag_depends import table_etag
 from schemas.department_schema import *
 
 
@@ -14,14 +15,28 @@ department_router = APIRouter(
 
 @department_router.get("",  response_model=List[DepartmentPostSchema])
 async def get_all_department(
-        page_size: Optional[int] = 10,
-        start_index: Optional[int] = 0,
+        page_size: int = Query(10, ge=1, le=1000),
+        start_index: Optional[int] = None,
+        after: Optional[str] = None,
+        sort: DepartmentSort = "id",
+        etag: str = Depends(table_etag("departments")),
         department_service: DepartmentService = Depends()
 ):
-    return await department_service.list(page_size, start_index)
+    """Pass X-Next-Cursor header of a page as after to get the next one, start_index pages by offset instead."""
 
+    if start_index is not None:
+        items = await department_service.list(page_size, start_index, department_rows.fields)
+        return Response(department_rows.dump_json(items), media_type="application/json", headers={"ETag": etag})
 
-@department_router.get("/{department_id}", response_model=DepartmentPostSchema)
+    page = await department_service.page(page_size, after, sort, department_rows.fields)
+    response = Response(department_rows.dump_json(page['items']), media_type="application/json", headers={"ETag": etag})
+    if page['next_cursor']:
+        response.headers['X-Next-Cursor'] = page['next_cursor']
+    return response
+
+
+@department_router.get("/{department_id}", response_model=DepartmentPostSchema,
+                       dependencies=[Depends(table_etag("departments"))])
 async def get_department(
         department_id: int,
         department_service: DepartmentService = Depends()
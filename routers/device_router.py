@@ -1,10 +1,11 @@
 from typing import Optional, List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from starlette import status
 
 from services import DeviceService
 from schemas.device_schema import *
 from core.current_user_depends import get_current_user
+from core.etag_depends import table_etag
 
 device_router = APIRouter(
     prefix="/devices", tags=["Device"], dependencies=[Depends(get_current_user)]
@@ -13,14 +14,28 @@ device_router = APIRouter(
 
 @device_router.get("", response_model=List[DevicePostSchema])
 async def get_all_devices(
-        page_size: Optional[int] = 10,
-        start_index: Optional[int] = 0,
+        page_size: int = Query(10, ge=1, le=1000),
+        start_index: Optional[int] = None,
+        after: Optional[str] = None,
+        sort: DeviceSort = "id",
+        etag: str = Depends(table_etag("devices")),
         device_service: DeviceService = Depends()
 ):
-    return await device_service.list(page_size, start_index)
+    """Pass X-Next-Cursor header of a page as after to get the next one, start_index pages by offset instead."""
 
+    if start_index is not None:
+        items = await device_service.list(page_size, start_index, device_rows.fields)
+        return Response(device_rows.dump_json(items), media_type="application/json", headers={"ETag": etag})
 
-@device_router.get("/{device_id}", response_model=DevicePostSchema)
+    page = await device_service.page(page_size, after, sort, device_rows.fields)
+    response = Response(device_rows.dump_json(page['items']), media_type="application/json", headers={"ETag": etag})
+    if page['next_cursor']:
+        response.headers['X-Next-Cursor'] = page['next_cursor']
+    return response
+
+
+@device_router.get("/{device_id}", response_model=DevicePostSchema,
+                   dependencies=[Depends(table_etag("devices"))])
 async def get_device(
         device_id,
         device_service: DeviceService = Depends()
@@ -53,6 +68,21 @@ async def create_device(
     return await device_service.create(device)
 
 
+@device_router.get("/{device_id}/access_list", response_model=AccessListSchema)
+async def get_access_list(
+        device_id: int,
+        since: Optional[int] = Query(None, ge=0),
+        device_service: DeviceService = Depends()
+):
+    """
+       Cards allowed on the device with their validity windows, for the controller to check offline.
+       Pass version of the last answer as since to get only the changes after it: entries added or changed
+       and removed card ids (possibly of cards the controller does not hold). full is true when the whole
+       list is returned instead and must replace the one the controller has.
+    """
+    return await device_service.access_list(device_id, since)
+
+
 @device_router.get("/{device_id}/employees")
 async def get_employees(
         device_id: int,
@@ -69,6 +99,30 @@ async def provide_employee_access_to_device(
     await device_service.add_employee(body)
 
 
+@device_router.post("/access/grant", response_model=DeviceAccessChangeSchema)
+async def grant_access_to_devices(
+        body: DeviceAccessSchema,
+        device_service: DeviceService = Depends()
+):
+    """
+       Give employee_ids, or every employee of department_id, access to all device_ids.
+       changed is the number of access records created; existing ones are left as they are.
+    """
+    return await device_service.grant_access(body)
+
+
+@device_router.post("/access/revoke", response_model=DeviceAccessChangeSchema)
+async def revoke_access_to_devices(
+        body: DeviceAccessSchema,
+        device_service: DeviceService = Depends()
+):
+    """
+       Take all device_ids away from employee_ids, or from every employee of department_id.
+       changed is the number of access records removed.
+    """
+    return await device_service.revoke_access(body)
+
+
 @device_router.delete("/{device_id}/employees/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def forbid_employee_access_to_device(
         device_id: int,
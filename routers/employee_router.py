@@ -1,8 +1,10 @@
 from typing import Optional, List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response, UploadFile
 from starlette import status
 from services import EmployeeService
+from services.employee_import import read_rows
 from core.current_user_depends import get_current_user
+from core.etag_depends import table_etag
 from schemas.employee_schema import *
 
 
@@ -13,14 +15,32 @@ employee_router = APIRouter(
 
 @employee_router.get("", response_model=List[EmployeePostSchema])
 async def get_all_employee(
-        page_size: Optional[int] = 10,
-        start_index: Optional[int] = 0,
+        page_size: int = Query(10, ge=1, le=1000),
+        start_index: Optional[int] = None,
+        after: Optional[str] = None,
+        sort: EmployeeSort = "id",
+        filters: EmployeeFilterSchema = Depends(),
+        etag: str = Depends(table_etag("employees")),
         employee_service: EmployeeService = Depends()
 ):
-    return await employee_service.list(page_size, start_index)
+    """
+       Pass X-Next-Cursor header of a page as after to get the next one, start_index pages by offset instead.
+       Only employees matching every given filter are listed.
+    """
 
+    if start_index is not None:
+        items = await employee_service.list(page_size, start_index, employee_rows.fields, filters)
+        return Response(employee_rows.dump_json(items), media_type="application/json", headers={"ETag": etag})
 
-@employee_router.get("/{employee_id}", response_model=EmployeePostSchema)
+    page = await employee_service.page(page_size, after, sort, employee_rows.fields, filters)
+    response = Response(employee_rows.dump_json(page['items']), media_type="application/json", headers={"ETag": etag})
+    if page['next_cursor']:
+        response.headers['X-Next-Cursor'] = page['next_cursor']
+    return response
+
+
+@employee_router.get("/{employee_id}", response_model=EmployeePostSchema,
+                     dependencies=[Depends(table_etag("employees"))])
 async def get_employee(
         employee_id: int,
         employee_service: EmployeeService = Depends()
@@ -53,6 +73,19 @@ async def create_employee(
     return await employee_service.create(employee)
 
 
+@employee_router.post("/import", response_model=EmployeeImportReportSchema)
+async def import_employees(
+        file: UploadFile,
+        file_format: Optional[EmployeeImportFormat] = Query(None, alias="format"),
+        employee_service: EmployeeService = Depends()
+):
+    """
+       Create employees from a CSV file with a header line or an NDJSON file, one employee per row.
+       The format is taken from the content type or extension of the file unless given.
+    """
+    return await employee_service.import_rows(read_rows(file, file_format))
+
+
 @employee_router.get("/{employee_id}/devices")
 async def get_devices(
         employee_id: int,
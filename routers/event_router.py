@@ -1,6 +1,15 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette import status
+
 from services import EventService
-from schemas.event_schema import EventPostSchema
+from services.event_export import MEDIA_TYPES
+from core.current_user_depends import get_current_user
+from schemas.event_schema import (EventPostSchema, DropInBatchSchema, DropInResultSchema, SwipeFrameSchema,
+                                  EventPageSchema, EventExportFormat)
 
 event_router = APIRouter(
      tags=["Event"]
@@ -16,3 +25,85 @@ async def attempt_to_drop_in_the_door(
 
     is_possible = await event_service.check_entry_possibility(card_id, imei)
     return is_possible
+
+
+@event_router.post("/drop_in/batch", response_model=List[DropInResultSchema])
+async def replay_buffered_drop_ins(
+        body: DropInBatchSchema,
+        event_service: EventService = Depends()
+) -> List[dict]:
+
+    return await event_service.check_entry_possibility_batch(body.events)
+
+
+@event_router.get("/events", response_model=EventPageSchema, dependencies=[Depends(get_current_user)])
+async def get_events(
+        employee_id: Optional[int] = None,
+        device_id: Optional[int] = None,
+        success: Optional[bool] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        page_size: int = Query(100, ge=1, le=1000),
+        after: Optional[str] = None,
+        event_service: EventService = Depends()
+) -> dict:
+    """Event history, oldest first. Pass next_cursor of a page as after to get the next one."""
+
+    return await event_service.history(page_size, after, employee_id, device_id, success, date_from, date_to)
+
+
+@event_router.get("/events/export", dependencies=[Depends(get_current_user)])
+async def export_events(
+        employee_id: Optional[int] = None,
+        device_id: Optional[int] = None,
+        success: Optional[bool] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        file_format: EventExportFormat = Query("ndjson", alias="format"),
+        gzip: bool = False,
+        event_service: EventService = Depends()
+) -> StreamingResponse:
+    """Every matching event, oldest first, streamed as NDJSON or CSV and gzipped on request."""
+
+    headers = {"Content-Disposition": f'attachment; filename="events.{file_format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        event_service.export(file_format, gzip, employee_id, device_id, success, date_from, date_to),
+        media_type=MEDIA_TYPES[file_format], headers=headers)
+
+
+@event_router.websocket("/drop_in/ws/{imei}")
+async def door_reader_channel(
+        websocket: WebSocket,
+        imei: str,
+        event_service: EventService = Depends()
+) -> None:
+    """Persistent channel of a door reader.
+
+    The reader is identified by imei once, when connecting, then sends
+    {"card_id": ...} text frames and receives {"card_id": ..., "entry": ...} answers.
+    Binary and malformed frames are answered with {"error": "Invalid frame"}.
+    """
+
+    if not await event_service.is_device_registered(imei):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            try:
+                frame = SwipeFrameSchema.model_validate_json(message.get("text") or "")
+            except ValidationError:
+                await websocket.send_json({"error": "Invalid frame"})
+                continue
+
+            is_possible = await event_service.check_entry_possibility(frame.card_id, imei)
+            await event_service.release()
+            await websocket.send_json({"card_id": frame.card_id, **is_possible})
+    except WebSocketDisconnect:
+        pass
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+
+from core.current_user_depends import get_current_user
+from schemas.occupancy_schema import OccupancySchema, DepartmentOccupancySchema
+from services.occupancy import occupancy
+
+
+occupancy_router = APIRouter(
+    prefix="/occupancy", tags=["Occupancy"], dependencies=[Depends(get_current_user)]
+)
+
+
+@occupancy_router.get("", response_model=OccupancySchema)
+async def get_site_occupancy():
+    employees = occupancy.site()
+    return {'inside': len(employees), 'employee_ids': sorted(employees), 'departments': occupancy.counts()}
+
+
+@occupancy_router.get("/{department_id}", response_model=DepartmentOccupancySchema)
+async def get_department_occupancy(department_id: int):
+    employees = occupancy.department(department_id)
+    return {'department_id': department_id, 'inside': len(employees), 'employee_ids': sorted(employees)}
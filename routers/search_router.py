@@ -0,0 +1,25 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query
+
+from services import SearchService
+from schemas.search_schema import SearchResultSchema
+from core.current_user_depends import get_current_user
+
+
+search_router = APIRouter(
+    prefix="/search", tags=["Search"], dependencies=[Depends(get_current_user)]
+)
+
+
+@search_router.get("", response_model=List[SearchResultSchema])
+async def search(
+        q: str = Query(min_length=3, max_length=100),
+        limit: int = Query(20, ge=1, le=100),
+        search_service: SearchService = Depends()
+):
+    """
+       Employees and devices whose name, surname or imei contain the fragments of q, best match first.
+       Employees and devices are each ranked against their own best match, then merged.
+    """
+
+    return await search_service.search(q, limit)
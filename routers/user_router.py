@@ -3,11 +3,13 @@ from starlette import status
 from fastapi import (
     APIRouter,
     Depends,
-    HTTPException
+    HTTPException,
+    Query,
+    Response
 )
 
 from models import User
-from schemas.user_schema import UserSchema, UserPostSchema, UpdateUserSchema
+from schemas.user_schema import UserSchema, UserPostSchema, UpdateUserSchema, UserSort
 from services.user_service import UserService
 from core.current_user_depends import get_current_user
 
@@ -31,12 +33,22 @@ async def create_user(
 
 @user_router.get("", response_model=List[UserPostSchema])
 async def get_all_users(
-        page_size: Optional[int] = 10,
-        start_index: Optional[int] = 0,
+        response: Response,
+        page_size: int = Query(10, ge=1, le=1000),
+        start_index: Optional[int] = None,
+        after: Optional[str] = None,
+        sort: UserSort = "id",
         user_service: UserService = Depends()
 ):
+    """Pass X-Next-Cursor header of a page as after to get the next one, start_index pages by offset instead."""
 
-    return await user_service.list(page_size, start_index)
+    if start_index is not None:
+        return await user_service.list(page_size, start_index)
+
+    page = await user_service.page(page_size, after, sort)
+    if page['next_cursor']:
+        response.headers['X-Next-Cursor'] = page['next_cursor']
+    return page['items']
 
 
 @user_router.get("/{user_id}", response_model=UserPostSchema)
@@ -0,0 +1,15 @@
+from datetime import date, datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class AttendanceSchema(BaseModel):
+    employee_id: int
+    day: date
+    first_entry: Optional[datetime]
+    last_exit: Optional[datetime]
+
+
+class AttendancePageSchema(BaseModel):
+    items: List[AttendanceSchema]
+    next_cursor: Optional[str] = None
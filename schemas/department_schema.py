@@ -1,5 +1,11 @@
+from typing import Literal
 from pydantic import BaseModel
 
+from core.serialization import RowSerializer
+
+
+DepartmentSort = Literal["id", "-id", "name", "-name"]
+
 
 class DepartmentSchema(BaseModel):
     name: str
@@ -7,3 +13,6 @@ class DepartmentSchema(BaseModel):
 
 class DepartmentPostSchema(DepartmentSchema):
     id: int
+
+
+department_rows = RowSerializer(DepartmentPostSchema)
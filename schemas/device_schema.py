@@ -1,5 +1,13 @@
+from datetime import date
+from typing import List, Literal
 import enum
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+
+from core.environment import settings
+from core.serialization import RowSerializer
+
+
+DeviceSort = Literal["id", "-id", "name", "-name", "imei", "-imei"]
 
 
 class RouteEnum(str, enum.Enum):
@@ -36,3 +44,37 @@ class UpdateDeviceSchema(BaseModel):
 class DeviceEmployeePostRequestSchema(BaseModel):
     device_id: int
     employee_id: int
+
+
+class DeviceAccessSchema(BaseModel):
+    device_ids: List[int] = Field(min_length=1, max_length=settings.ACCESS_BULK_MAX_SIZE)
+    employee_ids: List[int] = Field([], max_length=settings.ACCESS_BULK_MAX_SIZE)
+    department_id: int | None = None
+
+    @model_validator(mode='after')
+    def check_employees(self):
+        if (self.department_id is None) == (not self.employee_ids):
+            raise ValueError('Exactly one of employee_ids and department_id must be given')
+        return self
+
+
+class DeviceAccessChangeSchema(BaseModel):
+    changed: int
+
+
+class AccessListEntrySchema(BaseModel):
+    card_id: int
+    card_start_date: date
+    card_finish_date: date
+
+
+class AccessListSchema(BaseModel):
+    device_id: int
+    version: int
+    opened: bool
+    full: bool
+    entries: List[AccessListEntrySchema]
+    removed: List[int]
+
+
+device_rows = RowSerializer(DevicePostSchema)
@@ -1,6 +1,15 @@
+from typing import List, Literal
 from pydantic import BaseModel, model_validator
 from datetime import date
 
+from core.serialization import RowSerializer
+
+
+EmployeeSort = Literal[
+    "id", "-id", "name", "-name", "surname", "-surname", "card_id", "-card_id", "card_finish_date", "-card_finish_date"
+]
+EmployeeImportFormat = Literal["csv", "ndjson"]
+
 
 class EmployeeSchema(BaseModel):
 
@@ -33,6 +42,17 @@ class EmployeeSchema(BaseModel):
     }
 
 
+class EmployeeFilterSchema(BaseModel):
+    """Employees matching every given filter. Name prefixes are case-sensitive."""
+
+    name_prefix: str | None = None
+    surname_prefix: str | None = None
+    department_id: int | None = None
+    card_expires_from: date | None = None
+    card_expires_to: date | None = None
+    device_id: int | None = None
+
+
 class UpdateEmployeeSchema(BaseModel):
 
     name: str | None = None
@@ -49,3 +69,17 @@ class EmployeePostSchema(EmployeeSchema):
     @model_validator(mode='after')
     def check_date(self):
         return self
+
+
+class EmployeeImportErrorSchema(BaseModel):
+    line: int
+    errors: List[str]
+
+
+class EmployeeImportReportSchema(BaseModel):
+    imported: int
+    failed: int
+    errors: List[EmployeeImportErrorSchema]
+
+
+employee_rows = RowSerializer(EmployeePostSchema)
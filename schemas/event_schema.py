@@ -1,4 +1,8 @@
-from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+
+from core.environment import settings
 
 
 class EventPostSchema(BaseModel):
@@ -14,4 +18,50 @@ class EventPostSchema(BaseModel):
                 }
             ]
         }
-    }
\ No newline at end of file
+    }
+
+
+class DropInSchema(BaseModel):
+    card_id: int
+    imei: str
+    created_date: datetime
+
+
+class DropInBatchSchema(BaseModel):
+    events: List[DropInSchema] = Field(max_length=settings.DROP_IN_BATCH_MAX_SIZE)
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "events": [
+                        {"card_id": 11111111, "imei": "111111qwerty", "created_date": "2024-01-06T09:00:00"}
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class DropInResultSchema(DropInSchema):
+    entry: str
+
+
+class SwipeFrameSchema(BaseModel):
+    card_id: int
+
+
+EventExportFormat = Literal["ndjson", "csv"]
+
+
+class EventSchema(BaseModel):
+    id: int
+    device_id: Optional[int]
+    employee_id: Optional[int]
+    created_date: datetime
+    success: bool
+
+
+class EventPageSchema(BaseModel):
+    items: List[EventSchema]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,14 @@
+from typing import Dict, List
+from pydantic import BaseModel
+
+
+class OccupancySchema(BaseModel):
+    inside: int
+    employee_ids: List[int]
+    departments: Dict[int, int]
+
+
+class DepartmentOccupancySchema(BaseModel):
+    department_id: int
+    inside: int
+    employee_ids: List[int]
@@ -0,0 +1,9 @@
+from typing import Literal
+from pydantic import BaseModel
+
+
+class SearchResultSchema(BaseModel):
+    kind: Literal["employee", "device"]
+    id: int
+    title: str
+    detail: str | None = None
@@ -1,6 +1,10 @@
+from typing import Literal
 from pydantic import BaseModel, EmailStr
 
 
+UserSort = Literal["id", "-id", "email", "-email"]
+
+
 class UserSchema(BaseModel):
     email: EmailStr
     password: str
@@ -2,4 +2,6 @@ from .department_service import DepartmentService
 from .employee_service import EmployeeService
 from .device_service import DeviceService
 from .event_service import EventService
-from .user_service import UserService
\ No newline at end of file
+from .user_service import UserService
+from .attendance_service import AttendanceService
+from .search_service import SearchService
@@ -0,0 +1,106 @@
+from datetime import date
+from typing import NamedTuple, Set, Tuple
+
+from sqlalchemy import Row
+
+
+class CardEntry(NamedTuple):
+    employee_id: int
+    card_start_date: date
+    card_finish_date: date
+    devices: Set[int]
+    denied: Set[int]
+
+
+class DeviceEntry(NamedTuple):
+    id: int
+    opened: bool
+    department_id: int
+    route: str
+
+
+class AccessIndex:
+    """In-process index of everything a door access decision needs.
+
+    Entries are filled from the single-statement access check on first use
+    and kept in sync by the mutations in DeviceService and EmployeeService,
+    so repeated swipes are answered without a SQL round-trip.
+    For every card the index remembers the devices it is known to be
+    allowed (``devices``) or not allowed (``denied``) to pass through.
+    Every mutation bumps ``generation``: a decision read from the database
+    is stored only if no mutation happened while it was being loaded.
+    """
+
+    def __init__(self) -> None:
+        self._cards: dict[int, CardEntry] = {}
+        self._card_by_employee: dict[int, int] = {}
+        self._devices: dict[str, DeviceEntry] = {}
+        self.generation = 0
+
+    def get_card(self, card_id: int) -> CardEntry | None:
+        return self._cards.get(card_id)
+
+    def get_device(self, imei: str) -> DeviceEntry | None:
+        return self._devices.get(imei)
+
+    def put_decision(
+        self, card_id: int, imei: str, decision: Row, generation: int
+    ) -> Tuple[CardEntry, DeviceEntry | None]:
+        """Merge result of the access check into the index if it is still current."""
+
+        current = generation == self.generation
+        card = self._cards.get(card_id) if current else None
+        if card is None or card.employee_id != decision.employee_id:
+            card = CardEntry(decision.employee_id, decision.card_start_date, decision.card_finish_date,
+                             set(), set())
+
+        device = None
+        if decision.device_id is not None:
+            device = DeviceEntry(decision.device_id, decision.opened, decision.department_id, decision.route)
+            (card.devices if decision.allowed else card.denied).add(decision.device_id)
+
+        if current:
+            self._cards[card_id] = card
+            self._card_by_employee[decision.employee_id] = card_id
+            if device:
+                self._devices[imei] = device
+        return card, device
+
+    def discard_employee(self, employee_id: int) -> None:
+        self.generation += 1
+        card_id = self._card_by_employee.pop(employee_id, None)
+        if card_id is not None:
+            self._cards.pop(card_id, None)
+
+    def discard_device(self, imei: str, device_id: int | None = None) -> None:
+        """Forget device, and with device_id also forget every decision made for it."""
+
+        self.generation += 1
+        self._devices.pop(imei, None)
+        if device_id is not None:
+            for card in self._cards.values():
+                card.devices.discard(device_id)
+                card.denied.discard(device_id)
+
+    def grant(self, employee_id: int, device_id: int) -> None:
+        self.generation += 1
+        card = self._cards.get(self._card_by_employee.get(employee_id))
+        if card:
+            card.devices.add(device_id)
+            card.denied.discard(device_id)
+
+    def revoke(self, employee_id: int, device_id: int) -> None:
+        self.generation += 1
+        card = self._cards.get(self._card_by_employee.get(employee_id))
+        if card:
+            card.devices.discard(device_id)
+            card.denied.add(device_id)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._cards.clear()
+        self._card_by_employee.clear()
+        self._devices.clear()
+
+
+access_index = AccessIndex()
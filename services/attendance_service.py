@@ -0,0 +1,45 @@
+from datetime import date
+from typing import Optional
+from fastapi import Depends
+
+from core.pagination import decode_cursor, encode_cursor, next_page
+from exc import raise_with_log
+from repository import AttendanceRepository
+
+
+class AttendanceService:
+    attendance_repository: AttendanceRepository
+
+    def __init__(
+        self, attendance_repository: AttendanceRepository = Depends()
+    ) -> None:
+        self.attendance_repository = attendance_repository
+
+    async def list(
+        self,
+        page_size: int = 100,
+        after: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        employee_id: Optional[int] = None,
+    ) -> dict:
+        """
+            One page of first-entry / last-exit rollups in (day, employee_id) order.
+            next_cursor is returned when there are more rollups after the page.
+        """
+
+        key = decode_cursor(after, date.fromisoformat, int) if after else None
+        rollups = await self.attendance_repository.list(page_size + 1, key, date_from, date_to, employee_id)
+
+        return next_page(rollups, page_size,
+                         lambda rollup: encode_cursor((rollup.day.isoformat(), rollup.employee_id)))
+
+    async def rebuild(self, date_from: date, date_to: date) -> None:
+        """
+            Catch-up job: recompute rollups of the given days from the events table.
+        """
+
+        if date_to < date_from:
+            raise_with_log(status_code=400, detail="date_to must be bigger or equal date_from.")
+        async with self.attendance_repository.unit_of_work():
+            await self.attendance_repository.rebuild(date_from, date_to)
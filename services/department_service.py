@@ -1,7 +1,8 @@
 from typing import Optional, Sequence
 from fastapi import Depends
-from sqlalchemy import exc
+from sqlalchemy import exc, Row
 
+from core.pagination import next_page
 from exc import raise_with_log
 from models import Department
 from repository import DepartmentRepository
@@ -20,19 +21,23 @@ class DepartmentService:
         self, department_body: DepartmentSchema
     ) -> Department:
         try:
-            return await self.department_repository.create(
-                Department(name=department_body.name)
-            )
+            async with self.department_repository.unit_of_work():
+                department = await self.department_repository.create(
+                    Department(name=department_body.name)
+                )
+                await self.department_repository.bump_version("departments")
         except exc.IntegrityError as e:
             raise_with_log(409, detail=f"Department with name:{department_body.name} already exist.")
+        return department
 
     async def delete(
         self, department_id: int
     ) -> None:
-        department = await self.get(department_id)
-
         try:
-            await self.department_repository.delete(department)
+            async with self.department_repository.unit_of_work():
+                department = await self.get(department_id)
+                await self.department_repository.delete(department)
+                await self.department_repository.bump_version("departments")
         except exc.IntegrityError as e:
             raise_with_log(409,
                            detail='This department cannot be deleted because either employees or devices belong to it')
@@ -46,23 +51,37 @@ class DepartmentService:
         return department
 
     async def list(
-        self, page_size: Optional[int] = 10, start_index: Optional[int] = 0,
-    ) -> Sequence[Department]:
-        return await self.department_repository.list(page_size, start_index)
+        self, page_size: Optional[int] = 10, start_index: Optional[int] = 0, fields: Optional[Sequence[str]] = None,
+    ) -> Sequence[Department | Row]:
+        return await self.department_repository.list(page_size, start_index, fields)
+
+    async def page(
+        self, page_size: int = 10, after: Optional[str] = None, sort: str = "id",
+        fields: Optional[Sequence[str]] = None,
+    ) -> dict:
+        """
+            One page of departments in sort order, starting after the cursor.
+            next_cursor is returned when there are more departments after the page.
+        """
+
+        departments = await self.department_repository.list_after(page_size + 1, after, sort, fields)
+        return next_page(departments, page_size, lambda item: self.department_repository.cursor(item, sort))
 
     async def update(
         self, department_id: int, department_body: DepartmentSchema
     ) -> Department:
-        department = await self.get(department_id)
         department_body = department_body.model_dump(exclude_unset=True)
-        for key, value in department_body.items():
-            setattr(department, key, value)
-
         try:
-            return await self.department_repository.update(department)
+            async with self.department_repository.unit_of_work():
+                department = await self.get(department_id)
+                for key, value in department_body.items():
+                    setattr(department, key, value)
+                department = await self.department_repository.update(department)
+                await self.department_repository.bump_version("departments")
         except exc.IntegrityError as e:
             raise_with_log(status_code=409,
                            detail=f"Department with name:{department_body.get('name', '')} already exist.")
+        return department
 
 
 
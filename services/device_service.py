@@ -1,10 +1,12 @@
 from typing import List, Optional, Sequence
 from fastapi import Depends
-from sqlalchemy import exc
+from sqlalchemy import exc, Row
 
+from core.pagination import next_page
 from models import Device, Employee
 from repository import DeviceRepository, DepartmentRepository, EmployeeRepository
-from schemas.device_schema import DeviceSchema, UpdateDeviceSchema, DeviceEmployeePostRequestSchema
+from schemas.device_schema import DeviceSchema, UpdateDeviceSchema, DeviceEmployeePostRequestSchema, DeviceAccessSchema
+from services.access_index import access_index
 from exc import raise_with_log
 
 
@@ -29,23 +31,32 @@ class DeviceService:
     ) -> Device:
 
         device_body = device_body.model_dump()
-        await self.__check_if_exist_department_id(device_body)
 
         try:
-            return await self.device_repository.create(
-                Device(**device_body)
-            )
+            async with self.device_repository.unit_of_work():
+                await self.__check_if_exist_department_id(device_body)
+                device = await self.device_repository.create(
+                    Device(**device_body)
+                )
+                await self.device_repository.record_access_list_reset(device.id)
+                await self.device_repository.bump_version("devices")
         except exc.IntegrityError as e:
             raise_with_log(status_code=409,
                            detail=f"Employee with card_id:{device_body['imei']} already exist.")
+        return device
 
     async def delete(
         self, device_id: int
     ) -> None:
 
-        device = await self.get(device_id, bound_employees=True)
-        device.employees = []
-        await self.device_repository.delete(device)
+        async with self.device_repository.unit_of_work():
+            device = await self.get(device_id, bound_employees=True)
+            device.employees = []
+            await self.device_repository.delete(device)
+            await self.device_repository.record_access_list_reset(device.id)
+            await self.device_repository.bump_version("devices")
+            await self.employee_repository.bump_version("employees")
+        access_index.discard_device(device.imei, device.id)
 
     async def get(
         self, device_id: int, bound_employees=False
@@ -56,26 +67,73 @@ class DeviceService:
         return device
 
     async def list(
-        self, page_size: Optional[int] = 100, start_index: Optional[int] = 0,
-    ) -> Sequence[Device]:
-        return await self.device_repository.list(page_size, start_index)
+        self, page_size: Optional[int] = 100, start_index: Optional[int] = 0, fields: Optional[Sequence[str]] = None,
+    ) -> Sequence[Device | Row]:
+        return await self.device_repository.list(page_size, start_index, fields)
+
+    async def page(
+        self, page_size: int = 100, after: Optional[str] = None, sort: str = "id",
+        fields: Optional[Sequence[str]] = None,
+    ) -> dict:
+        """
+            One page of devices in sort order, starting after the cursor.
+            next_cursor is returned when there are more devices after the page.
+        """
+
+        devices = await self.device_repository.list_after(page_size + 1, after, sort, fields)
+        return next_page(devices, page_size, lambda item: self.device_repository.cursor(item, sort))
 
     async def update(
         self, device_id: int, device_body: UpdateDeviceSchema
     ) -> Device:
-        device = await self.get(device_id)
         device_body = device_body.model_dump(exclude_unset=True)
-        if "department_id" in device_body:
-            await self.__check_if_exist_department_id(device_body)
-        for key, value in device_body.items():
-            setattr(device, key, value)
 
         try:
-            return await self.device_repository.update(device)
+            async with self.device_repository.unit_of_work():
+                device = await self.get(device_id)
+                imei = device.imei
+                if "department_id" in device_body:
+                    await self.__check_if_exist_department_id(device_body)
+                for key, value in device_body.items():
+                    setattr(device, key, value)
+                device = await self.device_repository.update(device)
+                if "opened" in device_body:
+                    await self.device_repository.record_access_list_reset(device.id)
+                await self.device_repository.bump_version("devices")
+            access_index.discard_device(imei)
+            return device
         except exc.IntegrityError as e:
             raise_with_log(status_code=409,
                            detail=f"Device with imei:{device_body['imei']} already exist.")
 
+    async def access_list(self, device_id: int, since: Optional[int] = None) -> dict:
+        """
+            Cards allowed on the device with their validity windows, as of version.
+            With since, entries holds only the cards added or changed after that version and removed
+            the cards taken away, unless the whole list changed meanwhile: then full is true.
+        """
+
+        # Read first, so a change committed meanwhile is at worst sent again on the next sync
+        version = await self.device_repository.get_access_list_version()
+        if since is not None and since > version:
+            raise_with_log(status_code=400, detail="Unknown access list version.")
+
+        device = await self.get(device_id)
+        full, card_ids = True, set()
+        if since is not None:
+            full, card_ids = await self.device_repository.get_access_list_changes(device.id, since)
+
+        entries = await self.device_repository.get_access_list(device.id, device.opened, None if full else since)
+        removed = [] if full else sorted(card_ids - {entry.card_id for entry in entries})
+        return {
+            "device_id": device.id,
+            "version": version,
+            "opened": device.opened,
+            "full": full,
+            "entries": [entry._asdict() for entry in entries],
+            "removed": removed,
+        }
+
     async def __check_if_exist_department_id(self, device_body):
         """
             Сhecking the existence of a department.
@@ -101,38 +159,62 @@ class DeviceService:
             Adding an employee to gain access to the device.
         """
 
-        employee = await self.employee_repository.get(body.employee_id)
-        device = await self.device_repository.get(body.device_id, True)
-
-        if not employee or not device:
-            raise_with_log(status_code=400,
-                           detail="Incorrect employee_id or device_id")
+        async with self.device_repository.unit_of_work():
+            await self.__check_if_exist_employee_and_device(body.employee_id, body.device_id)
+            granted = await self.employee_repository.grant_access([body.device_id], [body.employee_id])
+            if granted:
+                await self.employee_repository.bump_version("employees")
 
-        try:
-            device.employees.append(employee)
-            await self.device_repository.update(device)
-        except exc.IntegrityError as e:
+        if not granted:
             raise_with_log(status_code=409,
                            detail=f"Employee already has access to this device!")
+        access_index.grant(body.employee_id, body.device_id)
 
     async def remove_employee(self, device_id: int, employee_id: int) -> None:
         """
             Take away access to the device from the specified employee.
         """
 
-        employee = await self.employee_repository.get(employee_id)
-        device = await self.device_repository.get(device_id, True)
+        async with self.device_repository.unit_of_work():
+            await self.__check_if_exist_employee_and_device(employee_id, device_id)
+            if await self.employee_repository.revoke_access([device_id], [employee_id]):
+                await self.employee_repository.bump_version("employees")
+        access_index.revoke(employee_id, device_id)
 
-        if not employee or not device:
-            raise_with_log(status_code=400,
-                           detail="Incorrect employee_id or device_id")
+    async def grant_access(self, body: DeviceAccessSchema) -> dict:
+        """
+            Give the employees, or every employee of the department, access to all the devices at once.
+        """
 
-        device.employees = list(filter(
-            lambda employee: employee.id != employee_id,
-            device.employees,
-        ))
+        async with self.employee_repository.unit_of_work():
+            granted = await self.employee_repository.grant_access(
+                body.device_ids, body.employee_ids, body.department_id)
+            if granted:
+                await self.employee_repository.bump_version("employees")
 
-        await self.device_repository.update(device)
+        for employee_id, device_id in granted:
+            access_index.grant(employee_id, device_id)
+        return {"changed": len(granted)}
 
+    async def revoke_access(self, body: DeviceAccessSchema) -> dict:
+        """
+            Take all the devices away from the employees, or from every employee of the department, at once.
+        """
+
+        async with self.employee_repository.unit_of_work():
+            revoked = await self.employee_repository.revoke_access(
+                body.device_ids, body.employee_ids, body.department_id)
+            if revoked:
+                await self.employee_repository.bump_version("employees")
 
+        for employee_id, device_id in revoked:
+            access_index.revoke(employee_id, device_id)
+        return {"changed": len(revoked)}
+
+    async def __check_if_exist_employee_and_device(self, employee_id: int, device_id: int) -> None:
+        employee = await self.employee_repository.get(employee_id)
+        device = await self.device_repository.get(device_id)
 
+        if not employee or not device:
+            raise_with_log(status_code=400,
+                           detail="Incorrect employee_id or device_id")
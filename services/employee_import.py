@@ -0,0 +1,120 @@
+import codecs
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from fastapi import UploadFile, status
+from starlette.concurrency import run_in_threadpool
+
+from exc import raise_with_log
+
+BLOCK_SIZE = 64 * 1024
+CSV_BATCH_SIZE = 1_000
+
+csv.field_size_limit(BLOCK_SIZE)
+
+# (line number, column values or None, parse error or None)
+ImportRow = Tuple[int, Dict[str, Any] | None, str | None]
+
+
+def detect_format(file: UploadFile) -> str:
+    """csv or ndjson, from the content type or the extension of the uploaded file."""
+
+    content_type = (file.content_type or "").split(";")[0].strip().lower()
+    filename = (file.filename or "").lower()
+    if content_type == "text/csv" or filename.endswith(".csv"):
+        return "csv"
+    if content_type in ("application/x-ndjson", "application/jsonl") or filename.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    raise_with_log(status.HTTP_400_BAD_REQUEST, "Unsupported file format, upload a CSV or NDJSON file")
+
+
+async def read_lines(file: UploadFile, block_size: int = BLOCK_SIZE) -> AsyncIterator[Tuple[int, str]]:
+    """Numbered lines of a UTF-8 file, read block by block so the file is never held in memory."""
+
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    number = 0
+    try:
+        while block := await file.read(block_size):
+            *lines, pending = (pending + decoder.decode(block)).split("\n")
+            for line in lines:
+                number += 1
+                yield number, line.rstrip("\r")
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise_with_log(status.HTTP_400_BAD_REQUEST, "File must be UTF-8 encoded")
+    if pending:
+        yield number + 1, pending.rstrip("\r")
+
+
+def read_records(reader, count: int) -> List[ImportRow]:
+    """Up to count non-empty records of reader, numbered by their first line."""
+
+    records = []
+    while len(records) < count:
+        line = reader.line_num + 1
+        try:
+            values = next(reader)
+        except StopIteration:
+            break
+        except csv.Error as e:
+            records.append((line, None, str(e)))
+            continue
+        if values:
+            records.append((line, values, None))
+    return records
+
+
+async def read_csv(file: UploadFile, batch_size: int = CSV_BATCH_SIZE) -> AsyncIterator[ImportRow]:
+    """Rows of a CSV file whose first line names the columns.
+
+    One csv.reader runs over the whole file, so quoted fields may span
+    lines. It reads batch_size records at a time on a worker thread, so
+    the event loop is not blocked by file reads. Fields longer than
+    BLOCK_SIZE characters are rejected.
+    """
+
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    reader = csv.reader(text)
+    header = None
+    try:
+        while records := await run_in_threadpool(read_records, reader, batch_size):
+            for line, values, error in records:
+                if error is not None:
+                    yield line, None, error
+                elif header is None:
+                    header = [name.strip() for name in values]
+                elif len(values) != len(header):
+                    yield line, None, f"Expected {len(header)} columns, got {len(values)}"
+                else:
+                    yield line, dict(zip(header, values)), None
+    except UnicodeDecodeError:
+        raise_with_log(status.HTTP_400_BAD_REQUEST, "File must be UTF-8 encoded")
+    finally:
+        text.detach()
+
+
+async def read_ndjson(file: UploadFile) -> AsyncIterator[ImportRow]:
+    """Rows of a file holding one JSON object per line."""
+
+    async for number, line in read_lines(file):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield number, None, "Invalid JSON"
+            continue
+        if isinstance(row, dict):
+            yield number, row, None
+        else:
+            yield number, None, "Expected a JSON object"
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson}
+
+
+def read_rows(file: UploadFile, file_format: str | None = None) -> AsyncIterator[ImportRow]:
+    return READERS[file_format or detect_format(file)](file)
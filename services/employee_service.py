@@ -1,10 +1,16 @@
-from typing import Optional, Sequence
+from typing import AsyncIterable, List, Optional, Sequence, Set, Tuple
 from fastapi import Depends, HTTPException
-from sqlalchemy import exc
+from pydantic import ValidationError
+from sqlalchemy import exc, Row
 
+from core.environment import settings
+from core.pagination import next_page
 from models import Employee
 from repository import EmployeeRepository, DepartmentRepository
-from schemas.employee_schema import EmployeeSchema, UpdateEmployeeSchema
+from schemas.employee_schema import EmployeeSchema, UpdateEmployeeSchema, EmployeeFilterSchema
+from services.access_index import access_index
+from services.employee_import import ImportRow
+from services.occupancy import occupancy
 from exc import raise_with_log
 
 
@@ -25,24 +31,105 @@ class EmployeeService:
     ) -> Employee:
 
         employee_body = employee_body.model_dump()
-        await self.__check_if_exist_department_id(employee_body)
 
         try:
-            return await self.employee_repository.create(
-                Employee(**employee_body)
-            )
+            async with self.employee_repository.unit_of_work():
+                await self.__check_if_exist_department_id(employee_body)
+                employee = await self.employee_repository.create(
+                    Employee(**employee_body)
+                )
+                await self.employee_repository.record_card_changes([employee.card_id])
+                await self.employee_repository.bump_version("employees")
         except exc.IntegrityError as e:
             raise HTTPException(status_code=409,
                                 detail=f"Employee with card_id:{employee_body['card_id']} already exist.")
+        return employee
+
+    async def import_rows(
+        self, rows: AsyncIterable[ImportRow], chunk_size: int = settings.EMPLOYEE_IMPORT_CHUNK_SIZE
+    ) -> dict:
+        """
+            Create employees from parsed rows, chunk_size rows per transaction.
+            Rows that fail validation are skipped and reported by line instead of failing the import.
+        """
+
+        report = {"imported": 0, "failed": 0, "errors": []}
+        card_ids: Set[int] = set()
+        chunk: List[Tuple[int, EmployeeSchema]] = []
+
+        async for line, row, error in rows:
+            if error is None:
+                try:
+                    chunk.append((line, EmployeeSchema.model_validate(row)))
+                except ValidationError as e:
+                    report["errors"].append({"line": line, "errors": [
+                        ".".join(map(str, err["loc"])) + ": " + err["msg"] if err["loc"] else err["msg"]
+                        for err in e.errors()
+                    ]})
+            else:
+                report["errors"].append({"line": line, "errors": [error]})
+
+            if len(chunk) >= chunk_size:
+                await self.__import_chunk(chunk, card_ids, report)
+                chunk = []
+
+        if chunk:
+            await self.__import_chunk(chunk, card_ids, report)
+
+        report["errors"].sort(key=lambda error: error["line"])
+        report["failed"] = len(report["errors"])
+        return report
+
+    async def __import_chunk(
+        self, chunk: List[Tuple[int, EmployeeSchema]], card_ids: Set[int], report: dict
+    ) -> None:
+        department_ids = await self.department_repository.get_existing_ids(
+            {employee.department_id for _, employee in chunk})
+        taken = {row.card_id for row in await self.employee_repository.get_by_card_ids(
+            {employee.card_id for _, employee in chunk})}
+
+        valid = []
+        for line, employee in chunk:
+            if employee.department_id not in department_ids:
+                error = "Incorrect department_id. Department with supplied ID does not exist."
+            elif employee.card_id in taken or employee.card_id in card_ids:
+                error = f"Employee with card_id:{employee.card_id} already exist."
+            else:
+                card_ids.add(employee.card_id)
+                valid.append((line, employee))
+                continue
+            report["errors"].append({"line": line, "errors": [error]})
+
+        if not valid:
+            return
+
+        try:
+            async with self.employee_repository.unit_of_work():
+                await self.employee_repository.create_many([employee.model_dump() for _, employee in valid])
+                await self.employee_repository.record_card_changes([employee.card_id for _, employee in valid])
+                await self.employee_repository.bump_version("employees")
+        except exc.IntegrityError:
+            report["errors"].extend(
+                {"line": line, "errors": [f"Employee with card_id:{employee.card_id} conflicts with a concurrent change."]}
+                for line, employee in valid
+            )
+            return
+
+        report["imported"] += len(valid)
 
     async def delete(
         self, employee_id: int
     ) -> None:
 
-        employee = await self.get(employee_id, bound_employees=True)
-        employee.devices = []
+        async with self.employee_repository.unit_of_work():
+            employee = await self.get(employee_id, bound_employees=True)
+            employee.devices = []
+            await self.employee_repository.delete(employee)
+            await self.employee_repository.record_card_changes([employee.card_id])
+            await self.employee_repository.bump_version("employees")
 
-        await self.employee_repository.delete(employee)
+        access_index.discard_employee(employee_id)
+        occupancy.forget(employee_id)
 
     async def get(
         self, employee_id: int, bound_employees=False
@@ -57,26 +144,47 @@ class EmployeeService:
         return employee
 
     async def list(
-        self, page_size: Optional[int] = 100, start_index: Optional[int] = 0,
-    ) -> Sequence[Employee]:
+        self, page_size: Optional[int] = 100, start_index: Optional[int] = 0, fields: Optional[Sequence[str]] = None,
+        filters: Optional[EmployeeFilterSchema] = None,
+    ) -> Sequence[Employee | Row]:
+
+        return await self.employee_repository.list(page_size, start_index, fields, filters)
+
+    async def page(
+        self, page_size: int = 100, after: Optional[str] = None, sort: str = "id",
+        fields: Optional[Sequence[str]] = None, filters: Optional[EmployeeFilterSchema] = None,
+    ) -> dict:
+        """
+            One page of employees matching the filters in sort order, starting after the cursor.
+            next_cursor is returned when there are more employees after the page.
+        """
 
-        return await self.employee_repository.list(page_size, start_index)
+        employees = await self.employee_repository.list_after(page_size + 1, after, sort, fields, filters)
+        return next_page(employees, page_size, lambda item: self.employee_repository.cursor(item, sort))
 
     async def update(
         self, employee_id: int, employee_body: UpdateEmployeeSchema
     ) -> Employee:
 
-        employee = await self.get(employee_id)
         employee_body = employee_body.model_dump(exclude_unset=True)
 
-        if "department_id" in employee_body:
-            await self.__check_if_exist_department_id(employee_body)
-
-        for key, value in employee_body.items():
-            setattr(employee, key, value)
-
         try:
-            return await self.employee_repository.update(employee)
+            async with self.employee_repository.unit_of_work():
+                employee = await self.get(employee_id)
+                card_id = employee.card_id
+
+                if "department_id" in employee_body:
+                    await self.__check_if_exist_department_id(employee_body)
+
+                for key, value in employee_body.items():
+                    setattr(employee, key, value)
+
+                employee = await self.employee_repository.update(employee)
+                if employee_body.keys() & {"card_id", "card_start_date", "card_finish_date"}:
+                    await self.employee_repository.record_card_changes({card_id, employee.card_id})
+                await self.employee_repository.bump_version("employees")
+            access_index.discard_employee(employee_id)
+            return employee
         except exc.IntegrityError as e:
             error = e.orig.args[0].lower()
 
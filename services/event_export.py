@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterable, AsyncIterator, Sequence
+
+from sqlalchemy import Row
+
+COLUMNS = ("id", "device_id", "employee_id", "created_date", "success")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def encode_ndjson(rows: Sequence[Row]) -> str:
+    return "".join(
+        json.dumps({
+            "id": row.id,
+            "device_id": row.device_id,
+            "employee_id": row.employee_id,
+            "created_date": row.created_date.isoformat(),
+            "success": row.success,
+        }) + "\n"
+        for row in rows
+    )
+
+
+def encode_csv(rows: Sequence[Row]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        (row.id, row.device_id, row.employee_id, row.created_date.isoformat(), row.success) for row in rows)
+    return buffer.getvalue()
+
+
+ENCODERS = {"ndjson": encode_ndjson, "csv": encode_csv}
+
+
+async def encode(
+    chunks: AsyncIterable[Sequence[Row]], file_format: str, compress: bool = False
+) -> AsyncIterator[bytes]:
+    """Body of an event export, encoded and, with compress, gzipped chunk by chunk."""
+
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def to_bytes(text: str) -> bytes:
+        data = text.encode()
+        return compressor.compress(data) if compressor else data
+
+    if file_format == "csv":
+        yield to_bytes(",".join(COLUMNS) + "\r\n")
+    async for rows in chunks:
+        data = to_bytes(ENCODERS[file_format](rows))
+        if data:
+            yield data
+    if compressor:
+        yield compressor.flush()
@@ -0,0 +1,126 @@
+import asyncio
+from typing import Awaitable, Callable, List
+
+from loguru import logger
+
+from core import metrics
+from core.database import async_session
+from core.environment import settings
+from models import Event
+from repository import EventRepository
+
+
+async def write_events(events: List[Event]) -> None:
+    async with async_session() as session:
+        repository = EventRepository(session)
+        async with repository.unit_of_work():
+            await repository.create_many(events)
+
+
+class EventJournal:
+    """Write-behind journal for door events.
+
+    Events are put into a bounded queue and a background task writes them
+    in batches: as soon as ``batch_size`` events are collected or
+    ``flush_interval_ms`` have passed since the first event of the batch.
+    When the queue is full ``put`` waits, so writers slow down instead of
+    losing events. ``stop`` writes whatever is left in the queue.
+
+    A batch that fails to write is retried ``retries`` times, waiting
+    ``retry_backoff_ms`` and then twice as long before each new attempt,
+    while the next batches wait in the queue. After that its events are
+    written one by one, so only those that still fail are dropped and
+    counted in event_journal_dropped_events_total.
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[List[Event]], Awaitable[None]] = write_events,
+        batch_size: int = settings.EVENT_JOURNAL_BATCH_SIZE,
+        flush_interval_ms: int = settings.EVENT_JOURNAL_FLUSH_INTERVAL_MS,
+        queue_size: int = settings.EVENT_JOURNAL_QUEUE_SIZE,
+        retries: int = settings.EVENT_JOURNAL_RETRIES,
+        retry_backoff_ms: int = settings.EVENT_JOURNAL_RETRY_BACKOFF_MS,
+    ) -> None:
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.queue_size = queue_size
+        self.retries = retries
+        self.retry_backoff = retry_backoff_ms / 1000
+        self._queue: asyncio.Queue[Event | None] | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(self.queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Write the remaining events and stop the background task."""
+
+        if not self.running:
+            return
+        task, self._task = self._task, None
+        await self._queue.put(None)
+        await task
+
+    async def put(self, event: Event) -> None:
+        await self._queue.put(event)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+            if batch[-1] is None:
+                batch.pop()
+                while not self._queue.empty():
+                    event = self._queue.get_nowait()
+                    if event is not None:
+                        batch.append(event)
+                await self._flush(batch)
+                return
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Event]) -> None:
+        if not batch:
+            return
+        backoff = self.retry_backoff
+        for attempt in range(self.retries + 1):
+            try:
+                await self.writer(batch)
+                return
+            except Exception:
+                logger.exception(f"Failed to write {len(batch)} events, attempt {attempt + 1}")
+            if attempt < self.retries:
+                await asyncio.sleep(backoff)
+                backoff *= 2
+
+        for event in batch:
+            try:
+                await self.writer([event])
+            except Exception:
+                logger.exception(f"Dropped event of employee {event.employee_id} at device {event.device_id}")
+                metrics.event_journal_dropped.inc()
+
+
+event_journal = EventJournal()
@@ -1,9 +1,18 @@
-from datetime import date
+from datetime import date, datetime
 from fastapi import Depends
-from typing import NamedTuple
+from typing import AsyncIterator, List, NamedTuple, Optional, Tuple
 
+from core.environment import settings
+from core.pagination import decode_cursor, encode_cursor, next_page
 from models import Event
 from repository import DeviceRepository, EventRepository, EmployeeRepository
+from schemas.event_schema import DropInSchema
+from services.access_index import access_index, CardEntry, DeviceEntry
+from services.event_export import encode
+from services.event_journal import event_journal
+from services.occupancy import occupancy
+
+ENTRY_ANSWERS = ('Admission are prohibited', 'Admission are permitted')
 
 
 class EventService:
@@ -26,37 +35,173 @@ class EventService:
         success: bool = False
         employee_id: int | None = None
         device_id: int | None = None
+        department_id: int | None = None
+        route: str | None = None
 
     async def create(
         self, event: EntryPossibility
     ) -> None:
-        await self.event_repository.create(
-            Event(device_id=event.device_id, employee_id=event.employee_id, success=event.success))
+        """
+            Record the attempt. While the event journal is running the event is only queued
+            and is written by the journal in the next batch. Occupancy is updated only once the
+            event has been written or accepted by the journal.
+        """
+
+        created_date = datetime.now()
+        record = Event(device_id=event.device_id, employee_id=event.employee_id,
+                       success=event.success, created_date=created_date)
+        if event_journal.running:
+            await event_journal.put(record)
+        else:
+            async with self.event_repository.unit_of_work():
+                await self.event_repository.create(record)
+        self.__update_occupancy(event, created_date)
 
     async def check_entry_possibility(self, card_id: int, imei: str):
         result = await self.__check_if_access_is_permitted(card_id, imei)
         await self.create(result)
-        return {'entry': ('Admission are prohibited', 'Admission are permitted')[result.success]}
+        return {'entry': ENTRY_ANSWERS[result.success]}
+
+    async def is_device_registered(self, imei: str) -> bool:
+        if access_index.get_device(imei):
+            return True
+        return await self.device_repository.get_device_id_and_device_opened(imei) is not None
+
+    async def release(self) -> None:
+        """
+            Give back the database connection between swipes of a long-lived reader channel,
+            so the channel never keeps a transaction open or reads a stale snapshot.
+        """
+
+        await self.event_repository.release()
+
+    async def check_entry_possibility_batch(self, swipes: List[DropInSchema]) -> List[dict]:
+        """
+            Decide swipes buffered by a controller while it was offline.
+            Cards, devices and access records of the whole batch are read with one query each,
+            card validity is checked against the date of the swipe, and all events are written
+            in one transaction with their original created_date.
+        """
+
+        if not swipes:
+            return []
+
+        cards = {card.card_id: card for card in
+                 await self.employee_repository.get_by_card_ids({swipe.card_id for swipe in swipes})}
+        devices = {device.imei: device for device in
+                   await self.device_repository.get_by_imeis({swipe.imei for swipe in swipes})}
+        access = await self.employee_repository.get_access_pairs(
+            {card.id for card in cards.values()}, {device.id for device in devices.values()})
+
+        events, results, decisions = [], [], []
+        for swipe in swipes:
+            card = cards.get(swipe.card_id)
+            device = devices.get(swipe.imei)
+            if not card:
+                result = self.EntryPossibility()
+            else:
+                allowed = device is not None and (card.id, device.id) in access
+                result = self.__decide(card.id, card.card_finish_date, device, allowed, swipe.created_date.date())
+
+            decisions.append((result, swipe.created_date))
+            events.append(Event(device_id=result.device_id, employee_id=result.employee_id,
+                                success=result.success, created_date=swipe.created_date))
+            results.append({**swipe.model_dump(), 'entry': ENTRY_ANSWERS[result.success]})
+
+        async with self.event_repository.unit_of_work():
+            await self.event_repository.create_many(events)
+        for result, created_date in decisions:
+            self.__update_occupancy(result, created_date)
+        return results
+
+    async def history(
+        self,
+        page_size: int = 100,
+        after: Optional[str] = None,
+        employee_id: Optional[int] = None,
+        device_id: Optional[int] = None,
+        success: Optional[bool] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> dict:
+        """
+            One page of the event history in (created_date, id) order.
+            next_cursor is returned when there are more events after the page.
+        """
+
+        key = decode_cursor(after, datetime.fromisoformat, int) if after else None
+        events = await self.event_repository.history(
+            page_size + 1, key, employee_id, device_id, success, date_from, date_to)
+
+        return next_page(events, page_size, lambda event: encode_cursor((event.created_date.isoformat(), event.id)))
+
+    def export(
+        self,
+        file_format: str = "ndjson",
+        compress: bool = False,
+        employee_id: Optional[int] = None,
+        device_id: Optional[int] = None,
+        success: Optional[bool] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+            The whole event history in (created_date, id) order as an NDJSON or CSV body.
+            Events are read and encoded EVENT_EXPORT_CHUNK_SIZE at a time while the body is sent.
+        """
+
+        chunks = self.event_repository.stream(
+            settings.EVENT_EXPORT_CHUNK_SIZE, employee_id, device_id, success, date_from, date_to)
+        return encode(chunks, file_format, compress)
 
     async def __check_if_access_is_permitted(self, card_id: int, imei: str):
 
-        employee = await self.employee_repository.get_by_card_id(card_id)
-        if not employee:
+        card, device = await self.__get_card_and_device(card_id, imei)
+        if not card:
             return self.EntryPossibility()
-        if employee.card_finish_date < date.today():
-            return self.EntryPossibility(False, employee.id, None)
-        device = await self.device_repository.get_device_id_and_device_opened(imei)
-
-        if device:
-            if device.opened:
-                return self.EntryPossibility(True, employee.id, device.id)
-            access = any(i.id == device.id for i in employee.devices)
-            if access:
-                return self.EntryPossibility(True, employee.id, device.id)
-            return self.EntryPossibility(False, employee.id, device.id)
-
-        return self.EntryPossibility(False, employee.id, None)
 
+        allowed = device is not None and device.id in card.devices
+        return self.__decide(card.employee_id, card.card_finish_date, device, allowed, date.today())
 
+    def __decide(
+        self, employee_id: int, card_finish_date: date, device: DeviceEntry | None, allowed: bool, day: date
+    ) -> EntryPossibility:
 
+        if card_finish_date < day:
+            return self.EntryPossibility(False, employee_id, None)
 
+        if device:
+            if device.opened:
+                return self.EntryPossibility(True, employee_id, device.id, device.department_id, device.route)
+            if allowed:
+                return self.EntryPossibility(True, employee_id, device.id, device.department_id, device.route)
+            return self.EntryPossibility(False, employee_id, device.id)
+
+        return self.EntryPossibility(False, employee_id, None)
+
+    @staticmethod
+    def __update_occupancy(event: EntryPossibility, created_date: datetime) -> None:
+        if event.success and event.route:
+            occupancy.record(event.employee_id, event.department_id, event.route, created_date)
+
+    async def __get_card_and_device(
+        self, card_id: int, imei: str
+    ) -> Tuple[CardEntry | None, DeviceEntry | None]:
+        """
+            Answer from the access index, running the access check in the database
+            only for what the index does not know yet.
+        """
+
+        card = access_index.get_card(card_id)
+        device = access_index.get_device(imei)
+
+        if card and card.card_finish_date < date.today():
+            return card, None
+        if card and device and (device.opened or device.id in card.devices or device.id in card.denied):
+            return card, device
+
+        generation = access_index.generation
+        decision = await self.employee_repository.get_access_decision(card_id, imei)
+        if not decision:
+            return None, None
+        return access_index.put_decision(card_id, imei, decision, generation)
@@ -0,0 +1,67 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import status
+
+from core.environment import settings
+from exc import raise_with_log
+
+T = TypeVar("T")
+
+
+class HashingPool:
+    """Runs password hashing on a dedicated worker pool.
+
+    A bcrypt round takes hundreds of milliseconds, so it is computed on one
+    of ``max_workers`` processes (or threads, which only help when the
+    bcrypt backend releases the GIL) instead of the event loop. At most
+    ``queue_size`` calls wait for a free worker; beyond that ``run`` fails
+    fast with 503 instead of piling up logins. Worker processes are
+    started by a forkserver, never forked from the app itself, whose
+    threads (aiosqlite, the event journal) may hold locks at fork time.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = settings.PASSWORD_HASHING_WORKERS,
+        queue_size: int = settings.PASSWORD_HASHING_QUEUE_SIZE,
+        executor: str = settings.PASSWORD_HASHING_EXECUTOR,
+    ) -> None:
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown password hashing executor: {executor}")
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.executor = executor
+        self.pending = 0
+        self._executor: Executor | None = None
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Call func(*args) on the pool; func and args must be picklable."""
+
+        if self.pending >= self.max_workers + self.queue_size:
+            raise_with_log(status.HTTP_503_SERVICE_UNAVAILABLE, "Too many concurrent logins, try again later")
+
+        self.start()
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        if self.executor == "process":
+            self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("forkserver"))
+        else:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="password-hashing")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool()
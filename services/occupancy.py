@@ -0,0 +1,74 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Set, Tuple
+
+from core.database import async_session
+from repository import EventRepository
+
+
+class Occupancy:
+    """Who is inside, per department and for the whole site.
+
+    Fed by every successful swipe: a swipe through an "enter" reader puts
+    the employee into the reader's department, a swipe through an "exit"
+    reader takes them out of it. The site is everyone inside at least one
+    department. Swipes older than the last one applied for the same
+    employee and department (replayed offline swipes) are ignored.
+    ``load_occupancy`` seeds it from the events table when the app starts.
+    """
+
+    def __init__(self) -> None:
+        self._departments: Dict[int, Set[int]] = defaultdict(set)
+        self._inside: Dict[int, Set[int]] = {}
+        self._last_swipe: Dict[Tuple[int, int], datetime] = {}
+
+    def record(self, employee_id: int, department_id: int, route: str, created_date: datetime) -> None:
+        last_swipe = self._last_swipe.get((employee_id, department_id))
+        if last_swipe and created_date < last_swipe:
+            return
+        self._last_swipe[employee_id, department_id] = created_date
+
+        if route == "enter":
+            self._departments[department_id].add(employee_id)
+            self._inside.setdefault(employee_id, set()).add(department_id)
+        else:
+            self._departments[department_id].discard(employee_id)
+            departments = self._inside.get(employee_id, set())
+            departments.discard(department_id)
+            if not departments:
+                self._inside.pop(employee_id, None)
+
+    def load(self, swipes: Iterable[Tuple[int, int, str, datetime]]) -> None:
+        """Replace the state with the given latest swipes of each employee per department."""
+
+        self.clear()
+        for employee_id, department_id, route, created_date in swipes:
+            self.record(employee_id, department_id, route, created_date)
+
+    def forget(self, employee_id: int) -> None:
+        for department_id in self._inside.pop(employee_id, set()):
+            self._departments[department_id].discard(employee_id)
+        for key in [key for key in self._last_swipe if key[0] == employee_id]:
+            del self._last_swipe[key]
+
+    def site(self) -> Set[int]:
+        return set(self._inside)
+
+    def department(self, department_id: int) -> Set[int]:
+        return set(self._departments.get(department_id, ()))
+
+    def counts(self) -> Dict[int, int]:
+        return {department_id: len(employees) for department_id, employees in self._departments.items() if employees}
+
+    def clear(self) -> None:
+        self._departments.clear()
+        self._inside.clear()
+        self._last_swipe.clear()
+
+
+occupancy = Occupancy()
+
+
+async def load_occupancy() -> None:
+    async with async_session() as session:
+        occupancy.load(await EventRepository(session).get_last_swipes())
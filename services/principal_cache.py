@@ -0,0 +1,72 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Set, Tuple
+
+from core.environment import settings
+from models import User
+
+
+class PrincipalCache:
+    """Bounded LRU cache of users resolved from access tokens.
+
+    An entry lives for ``ttl_seconds`` at most and never outlives its
+    token. When more than ``max_size`` tokens are cached the least recently
+    used one is evicted. UserService drops every token of a user when the
+    user is updated or deleted.
+    """
+
+    def __init__(
+        self,
+        max_size: int = settings.PRINCIPAL_CACHE_SIZE,
+        ttl_seconds: float = settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self._entries: OrderedDict[str, Tuple[User, float]] = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+
+    def get(self, token: str) -> User | None:
+        entry = self._entries.get(token)
+        if entry is None:
+            return
+        user, deadline = entry
+        if deadline <= time.monotonic():
+            self._remove(token)
+            return
+        self._entries.move_to_end(token)
+        return user
+
+    def put(self, token: str, user: User, expires_in: float) -> None:
+        """Cache user for token, which itself expires in ``expires_in`` seconds."""
+
+        if self.max_size <= 0 or self.ttl <= 0 or expires_in <= 0:
+            return
+        self._remove(token)
+        self._entries[token] = user, time.monotonic() + min(self.ttl, expires_in)
+        self._tokens_by_user.setdefault(user.id, set()).add(token)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def discard_user(self, user_id: int) -> None:
+        for token in self._tokens_by_user.pop(user_id, set()):
+            self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tokens_by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[0].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[0].id]
+
+
+principal_cache = PrincipalCache()
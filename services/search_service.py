@@ -0,0 +1,32 @@
+from typing import Sequence
+
+from fastapi import Depends, status
+from sqlalchemy import Row
+
+from exc import raise_with_log
+from repository import SearchRepository
+
+MIN_FRAGMENT_LENGTH = 3
+
+
+class SearchService:
+    search_repository: SearchRepository
+
+    def __init__(
+        self, search_repository: SearchRepository = Depends()
+    ) -> None:
+        self.search_repository = search_repository
+
+    async def search(self, text: str, limit: int = 20) -> Sequence[Row]:
+        """
+            Employees and devices containing every fragment of text in their name, surname or imei, best match first.
+            Fragments shorter than three characters cannot be looked up in the trigram index and are ignored.
+        """
+
+        fragments = [fragment for fragment in text.split() if len(fragment) >= MIN_FRAGMENT_LENGTH]
+        if not fragments:
+            raise_with_log(status.HTTP_400_BAD_REQUEST,
+                           f"Search text needs a fragment of at least {MIN_FRAGMENT_LENGTH} characters")
+
+        query = " ".join('"' + fragment.replace('"', '""') + '"' for fragment in fragments)
+        return await self.search_repository.search(query, limit)
@@ -1,3 +1,4 @@
+import time
 from datetime import timedelta, datetime
 from typing import Optional, Sequence
 
@@ -7,10 +8,13 @@ from passlib.context import CryptContext
 from sqlalchemy import exc
 
 from core.environment import settings
+from core.pagination import next_page
 from exc import raise_with_log
 from models import User
 from repository import UserRepository
 from schemas.user_schema import TokenSchema, UserSchema, UpdateUserSchema
+from services.hashing_pool import hashing_pool
+from services.principal_cache import principal_cache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -30,6 +34,18 @@ class HashingMixin:
 
         return pwd_context.hash(password)
 
+    @classmethod
+    async def verify_password_async(cls, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash on the hashing pool."""
+
+        return await hashing_pool.run(cls.verify_password, plain_password, hashed_password)
+
+    @classmethod
+    async def get_password_hash_async(cls, password: str) -> str:
+        """Generate a bcrypt hashed password on the hashing pool."""
+
+        return await hashing_pool.run(cls.get_password_hash, password)
+
 
 class UserService(HashingMixin):
 
@@ -41,14 +57,16 @@ class UserService(HashingMixin):
     async def create(self, user_body: UserSchema) -> User:
         """Add user with hashed password to database."""
 
+        hashed_password = await self.get_password_hash_async(user_body.password)
         try:
-            return await self.user_repository.create(
-                User(
-                    email=user_body.email,
-                    hashed_password=self.get_password_hash(user_body.password),
-                    is_superuser=user_body.is_superuser,
+            async with self.user_repository.unit_of_work():
+                return await self.user_repository.create(
+                    User(
+                        email=user_body.email,
+                        hashed_password=hashed_password,
+                        is_superuser=user_body.is_superuser,
+                    )
                 )
-            )
         except exc.IntegrityError as e:
             raise_with_log(status_code=409,
                            detail=f"User with email:{user_body.email} already exist.")
@@ -57,6 +75,14 @@ class UserService(HashingMixin):
         user = await self.user_repository.get_by_email(email)
         return user
 
+    async def get_token_user(self, user_id: int, issued_at: float) -> User | None:
+        """The user a token issued at issued_at was given to, None if the user was deleted or changed since."""
+
+        user = await self.user_repository.get(user_id)
+        if user is None or issued_at <= (user.tokens_valid_after or 0):
+            return None
+        return user
+
     async def get(self, user_id: int) -> User | None:
         user = await self.user_repository.get(user_id)
 
@@ -81,24 +107,23 @@ class UserService(HashingMixin):
         if not user:
             raise_with_log(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
 
-        if not self.verify_password(login.password, user.hashed_password):
+        if not await self.verify_password_async(login.password, user.hashed_password):
             raise_with_log(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect password")
 
-        access_token = self._create_access_token(email=login.username)
+        access_token = self._create_access_token(user)
 
         return TokenSchema(access_token=access_token, token_type=settings.TOKEN_TYPE)
 
-    def _create_access_token(self,  email: str) -> str:
-        """Encode user information and expiration time."""
+    def _create_access_token(self, user: User) -> str:
+        """Encode user information, role, issue and expiration time."""
 
         payload = {
-            "sub": email,
+            "sub": user.email,
+            "uid": user.id,
+            "is_superuser": user.is_superuser,
+            "iat": time.time(),
             "expires_at": self._expiration_time(),
         }
-        print(jwt.encode({
-            "expires_at": self._expiration_time(),
-        }, settings.TOKEN_KEY,
-                          algorithm=settings.TOKEN_ALGORITHM))
         return jwt.encode(payload, settings.TOKEN_KEY,
                           algorithm=settings.TOKEN_ALGORITHM)
 
@@ -113,24 +138,41 @@ class UserService(HashingMixin):
         self, user_id: int
     ) -> None:
 
-        user = await self.get(user_id)
-        await self.user_repository.delete(user)
+        async with self.user_repository.unit_of_work():
+            user = await self.get(user_id)
+            await self.user_repository.delete(user)
+        principal_cache.discard_user(user_id)
 
     async def list(
         self, page_size: Optional[int] = 100, start_index: Optional[int] = 0,
     ) -> Sequence[User]:
         return await self.user_repository.list(page_size, start_index)
 
+    async def page(
+        self, page_size: int = 100, after: Optional[str] = None, sort: str = "id",
+    ) -> dict:
+        """
+            One page of users in sort order, starting after the cursor.
+            next_cursor is returned when there are more users after the page.
+        """
+
+        users = await self.user_repository.list_after(page_size + 1, after, sort)
+        return next_page(users, page_size, lambda item: self.user_repository.cursor(item, sort))
+
     async def update(
         self, user_id: int, user_body: UpdateUserSchema
     ) -> User:
-        user = await self.get(user_id)
         user_body = user_body.model_dump(exclude_unset=True)
-        for key, value in user_body.items():
-            setattr(user, key, value)
         try:
-            return await self.user_repository.update(user)
+            async with self.user_repository.unit_of_work():
+                user = await self.get(user_id)
+                for key, value in user_body.items():
+                    setattr(user, key, value)
+                user.tokens_valid_after = time.time()
+                return await self.user_repository.update(user)
         except exc.IntegrityError as e:
             raise_with_log(status_code=409,
                            detail=f"User with email:{user_body.get('email', '')} already exist.")
+        finally:
+            principal_cache.discard_user(user_id)
 
@@ -0,0 +1,42 @@
+from datetime import datetime
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Device, Employee, Event
+from routers import attendance_router
+
+url_prefix = attendance_router.prefix
+pytestmark = pytest.mark.anyio
+
+
+async def test_rebuild_and_get_attendance(
+        authorized_superuser: AsyncClient,
+        employee: Employee,
+        device: Device,
+        session: AsyncSession) -> None:
+
+    session.add(Event(device_id=device.id, employee_id=employee.id, success=True,
+                      created_date=datetime(2024, 1, 10, 9)))
+    await session.commit()
+
+    response = await authorized_superuser.post(
+        f"{url_prefix}/rebuild", params={'date_from': '2024-01-01', 'date_to': '2024-01-31'})
+    assert response.status_code == 204
+
+    response = await authorized_superuser.get(
+        f"{url_prefix}", params={'date_from': '2024-01-01', 'date_to': '2024-01-31'})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        'items': [{'employee_id': employee.id, 'day': '2024-01-10',
+                   'first_entry': '2024-01-10T09:00:00', 'last_exit': None}],
+        'next_cursor': None,
+    }
+
+
+async def test_rebuild_error(authorized_superuser: AsyncClient) -> None:
+
+    response = await authorized_superuser.post(
+        f"{url_prefix}/rebuild", params={'date_from': '2024-01-31', 'date_to': '2024-01-01'})
+
+    assert response.status_code == 400
@@ -1,6 +1,11 @@
 import pytest
+from fastapi import FastAPI
 from httpx import AsyncClient
+from jose import jwt
+from core.environment import settings
 from routers import auth_router
+from services.user_service import UserService
+from models import User
 
 url_prefix = auth_router.prefix
 
@@ -15,6 +20,11 @@ async def test_authenticate(async_client: AsyncClient, superuser) -> None:
 
     assert response.status_code == 200
 
+    claims = jwt.decode(response.json()['access_token'], settings.TOKEN_KEY, algorithms=[settings.TOKEN_ALGORITHM])
+    assert claims['sub'] == superuser.email
+    assert claims['uid'] == superuser.id
+    assert claims['is_superuser'] is True
+
 
 @pytest.mark.parametrize(
     'data, response_detail',
@@ -34,3 +44,14 @@ async def test_authenticate_error(async_client: AsyncClient, data, response_deta
 
 
 
+
+
+async def test_token_of_unknown_user_is_rejected(test_app: FastAPI) -> None:
+
+    token = UserService(None)._create_access_token(User(id=100, email='unknown@gmail.com', is_superuser=True))
+
+    async with AsyncClient(app=test_app, base_url="http://localhost:8080",
+                           headers={"Authorization": f"Bearer {token}"}) as client:
+        response = await client.get("/users")
+
+    assert response.status_code == 401
@@ -53,3 +53,24 @@ async def test_create_department(authorized_superuser: AsyncClient) -> None:
 
 
 
+
+
+async def test_get_departments_not_modified(authorized_superuser: AsyncClient, department: Department) -> None:
+
+    response = await authorized_superuser.get(f"{url_prefix}")
+    etag = response.headers['etag']
+
+    response = await authorized_superuser.get(f"{url_prefix}", headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['etag'] == etag
+    assert response.content == b''
+
+    response = await authorized_superuser.get(f"{url_prefix}/{department.id}", headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+    await authorized_superuser.patch(f"{url_prefix}/{department.id}", json={'name': 'renamed_department'})
+
+    response = await authorized_superuser.get(f"{url_prefix}", headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['etag'] != etag
+    assert 'renamed_department' in [item['name'] for item in response.json()]
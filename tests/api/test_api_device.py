@@ -59,3 +59,59 @@ async def test_create_device(authorized_superuser: AsyncClient, department) -> N
 
 
 
+
+
+async def test_grant_and_revoke_access(authorized_superuser: AsyncClient, employee, device: Device) -> None:
+
+    data = {'device_ids': [device.id], 'department_id': employee.department_id}
+    response = await authorized_superuser.post(f"{url_prefix}/access/grant", json=data)
+
+    assert response.status_code == 200
+    assert response.json()['changed'] >= 1
+
+    response = await authorized_superuser.post(
+        f"{url_prefix}/access", json={'device_id': device.id, 'employee_id': employee.id})
+    assert response.status_code == 409
+
+    response = await authorized_superuser.post(
+        f"{url_prefix}/access/revoke", json={'device_ids': [device.id], 'employee_ids': [employee.id]})
+    assert response.json() == {'changed': 1}
+
+    response = await authorized_superuser.get(f"{url_prefix}/{device.id}/employees")
+    assert employee.id not in [bound['id'] for bound in response.json()]
+
+    response = await authorized_superuser.post(f"{url_prefix}/access/grant", json={'device_ids': [device.id]})
+    assert response.status_code == 422
+
+
+async def test_access_list_sync(authorized_superuser: AsyncClient, employee, device: Device) -> None:
+
+    response = await authorized_superuser.get(f"{url_prefix}/{device.id}/access_list")
+    assert response.status_code == 200
+    snapshot = response.json()
+    assert snapshot['full'] and snapshot['entries'] == [] and snapshot['removed'] == []
+
+    await authorized_superuser.post(f"{url_prefix}/access", json={'device_id': device.id, 'employee_id': employee.id})
+    response = await authorized_superuser.get(
+        f"{url_prefix}/{device.id}/access_list", params={'since': snapshot['version']})
+    delta = response.json()
+    entry = {'card_id': employee.card_id, 'card_start_date': employee.card_start_date.isoformat(),
+             'card_finish_date': employee.card_finish_date.isoformat()}
+    assert not delta['full'] and delta['entries'] == [entry] and delta['removed'] == []
+    assert delta['version'] > snapshot['version']
+
+    await authorized_superuser.delete(f"{url_prefix}/{device.id}/employees/{employee.id}")
+    response = await authorized_superuser.get(
+        f"{url_prefix}/{device.id}/access_list", params={'since': delta['version']})
+    delta = response.json()
+    assert not delta['full'] and delta['entries'] == [] and delta['removed'] == [employee.card_id]
+
+    await authorized_superuser.patch(f"{url_prefix}/{device.id}", json={'opened': True})
+    response = await authorized_superuser.get(
+        f"{url_prefix}/{device.id}/access_list", params={'since': delta['version']})
+    delta = response.json()
+    assert delta['full'] and delta['opened'] and entry in delta['entries']
+
+    response = await authorized_superuser.get(
+        f"{url_prefix}/{device.id}/access_list", params={'since': delta['version'] + 1})
+    assert response.status_code == 400
@@ -1,6 +1,6 @@
 import pytest
 from httpx import AsyncClient
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from models import Employee
 from routers import employee_router
 
@@ -70,3 +70,124 @@ async def test_create_employee(authorized_superuser: AsyncClient, department) ->
 
 
 
+
+
+async def test_get_all_employees_by_cursor(authorized_superuser: AsyncClient, department, session) -> None:
+
+    today = date.today()
+    session.add_all([
+        Employee(id=101, name='Leo', surname='Tolstoy', department_id=department.id, card_id=10101,
+                 card_start_date=today, card_finish_date=today + timedelta(days=30)),
+        Employee(id=102, name='Ivan', surname='Turgenev', department_id=department.id, card_id=10102,
+                 card_start_date=today, card_finish_date=today + timedelta(days=20)),
+        Employee(id=103, name='Nikolai', surname='Gogol', department_id=department.id, card_id=10103,
+                 card_start_date=today, card_finish_date=today + timedelta(days=30)),
+    ])
+    await session.commit()
+
+    ids, params = [], {'page_size': 2, 'sort': '-card_finish_date'}
+    while True:
+        response = await authorized_superuser.get(f"{url_prefix}", params=params)
+        assert response.status_code == 200
+        ids += [employee['id'] for employee in response.json()]
+        if 'x-next-cursor' not in response.headers:
+            break
+        params['after'] = response.headers['x-next-cursor']
+
+    assert ids[:3] == [103, 101, 102]
+
+    response = await authorized_superuser.get(f"{url_prefix}", params={**params, 'sort': 'surname'})
+    assert response.status_code == 400
+
+    response = await authorized_superuser.get(f"{url_prefix}", params={'sort': 'department_id'})
+    assert response.status_code == 422
+
+    response = await authorized_superuser.get(f"{url_prefix}", params={'page_size': 10, 'start_index': 1})
+    assert [employee['id'] for employee in response.json()][:3] == [101, 102, 103]
+
+
+async def test_import_employees(authorized_superuser: AsyncClient, department) -> None:
+
+    today = date.today().isoformat()
+    csv_file = (
+        "name,surname,department_id,card_start_date,card_finish_date,card_id\r\n"
+        f"Fyodor,Dostoevsky,{department.id},{today},{today},20201\r\n"
+        f"Anton,Chekhov,{department.id},{today},{today},20201\r\n"
+        f"Mikhail,Bulgakov,{department.id},{today},{today}\r\n"
+    )
+    response = await authorized_superuser.post(
+        f"{url_prefix}/import", files={'file': ('employees.csv', csv_file.encode(), 'text/csv')})
+
+    assert response.status_code == 200
+    assert response.json() == {'imported': 1, 'failed': 2, 'errors': [
+        {'line': 3, 'errors': ['Employee with card_id:20201 already exist.']},
+        {'line': 4, 'errors': ['Expected 6 columns, got 5']},
+    ]}
+
+    ndjson_file = "\n".join([
+        f'{{"name": "Maxim", "surname": "Gorky", "department_id": {department.id}, '
+        f'"card_start_date": "{today}", "card_finish_date": "{today}", "card_id": 20202}}',
+        '{"name": "Maxim"',
+    ])
+    response = await authorized_superuser.post(
+        f"{url_prefix}/import", params={'format': 'ndjson'}, files={'file': ('employees.txt', ndjson_file.encode())})
+
+    assert response.status_code == 200
+    assert response.json() == {'imported': 1, 'failed': 1, 'errors': [{'line': 2, 'errors': ['Invalid JSON']}]}
+
+    response = await authorized_superuser.get(f"{url_prefix}", params={'page_size': 1000})
+    assert {20201, 20202} <= {employee['card_id'] for employee in response.json()}
+
+    response = await authorized_superuser.post(
+        f"{url_prefix}/import", files={'file': ('employees.xlsx', b'', 'application/octet-stream')})
+    assert response.status_code == 400
+
+
+async def test_get_all_employees_filtered(authorized_superuser: AsyncClient, department, session) -> None:
+
+    today = date.today()
+    session.add_all([
+        Employee(name='Velimir', surname='Khlebnikov', department_id=department.id, card_id=30301,
+                 card_start_date=today, card_finish_date=today + timedelta(days=3)),
+        Employee(name='Vladimir', surname='Mayakovsky', department_id=department.id, card_id=30302,
+                 card_start_date=today, card_finish_date=today + timedelta(days=300)),
+    ])
+    await session.commit()
+
+    response = await authorized_superuser.get(f"{url_prefix}", params={
+        'name_prefix': 'V', 'card_expires_to': (today + timedelta(days=7)).isoformat()})
+
+    assert response.status_code == 200
+    assert [employee['card_id'] for employee in response.json()] == [30301]
+
+
+async def test_access_change_invalidates_device_filter(
+        authorized_superuser: AsyncClient, department, device, session) -> None:
+
+    employee = Employee(id=300, name='Ivan', surname='Bunin', department_id=department.id, card_id=30000,
+                        card_start_date=date.today(), card_finish_date=date.today())
+    session.add(employee)
+    await session.commit()
+
+    response = await authorized_superuser.get(f"{url_prefix}", params={'device_id': device.id})
+    etag = response.headers['etag']
+    assert employee.id not in [item['id'] for item in response.json()]
+
+    response = await authorized_superuser.post(
+        "/devices/access", json={'device_id': device.id, 'employee_id': employee.id})
+    assert response.status_code == 204
+
+    response = await authorized_superuser.get(
+        f"{url_prefix}", params={'device_id': device.id}, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert employee.id in [item['id'] for item in response.json()]
+    etag = response.headers['etag']
+
+    response = await authorized_superuser.post(
+        "/devices/access/revoke", json={'device_ids': [device.id], 'employee_ids': [employee.id]})
+    assert response.json() == {'changed': 1}
+
+    response = await authorized_superuser.get(
+        f"{url_prefix}", params={'device_id': device.id}, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert employee.id not in [item['id'] for item in response.json()]
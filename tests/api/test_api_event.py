@@ -1,5 +1,9 @@
+import csv
+import json
+from datetime import datetime, timedelta
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from models import *
 
@@ -36,10 +40,109 @@ async def test_attempt_to_drop_in_the_door(
     assert response.json() == has_permission
 
 
+@pytest.mark.anyio
+async def test_replay_buffered_drop_ins(
+        async_client: AsyncClient,
+        employee: Employee,
+        device: Device,
+        session: AsyncSession) -> None:
+
+    device.employees = [employee]
+    session.add(device)
+    await session.commit()
+
+    created_date = datetime.now() - timedelta(hours=1)
+    data = {'events': [
+        {'card_id': employee.card_id, 'imei': device.imei, 'created_date': created_date.isoformat()},
+        {'card_id': employee.card_id, 'imei': 'unknown', 'created_date': created_date.isoformat()},
+    ]}
+
+    response = await async_client.post("/drop_in/batch", json=data)
+
+    assert response.status_code == 200
+    assert [result['entry'] for result in response.json()] == ['Admission are permitted', 'Admission are prohibited']
+
+    result = await session.execute(select(Event).where(Event.created_date == created_date))
+    assert [(event.device_id, event.success) for event in result.scalars()] == [(device.id, True), (None, False)]
+
+
+@pytest.mark.anyio
+async def test_get_events_pages(
+        authorized_superuser: AsyncClient,
+        employee: Employee,
+        device: Device,
+        session: AsyncSession) -> None:
+
+    day = datetime(2020, 1, 1)
+    session.add_all([
+        Event(device_id=device.id, employee_id=employee.id, success=n % 2 == 0, created_date=day + timedelta(hours=n))
+        for n in range(5)
+    ])
+    await session.commit()
+    params = {'date_from': day.isoformat(), 'date_to': (day + timedelta(days=1)).isoformat(), 'page_size': 2}
+
+    pages = []
+    response = await authorized_superuser.get("/events", params=params)
+    while True:
+        assert response.status_code == 200
+        pages.append([event['created_date'] for event in response.json()['items']])
+        if not response.json()['next_cursor']:
+            break
+        response = await authorized_superuser.get(
+            "/events", params={**params, 'after': response.json()['next_cursor']})
 
+    assert pages == [
+        [(day + timedelta(hours=n)).isoformat() for n in range(start, min(start + 2, 5))]
+        for start in range(0, 5, 2)
+    ]
+
+    response = await authorized_superuser.get("/events", params={**params, 'success': False})
+    assert [event['success'] for event in response.json()['items']] == [False, False]
+
+
+@pytest.mark.anyio
+async def test_get_events_invalid_cursor(authorized_superuser: AsyncClient) -> None:
 
+    response = await authorized_superuser.get("/events", params={'after': 'not-a-cursor'})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_get_events_unauthorized(test_app) -> None:
 
+    async with AsyncClient(app=test_app, base_url="http://localhost:8080") as client:
+        response = await client.get("/events")
 
+    assert response.status_code == 401
 
 
 
+@pytest.mark.anyio
+async def test_export_events(
+        authorized_superuser: AsyncClient,
+        employee: Employee,
+        device: Device,
+        session: AsyncSession) -> None:
+
+    day = datetime(2019, 1, 1)
+    session.add_all([
+        Event(device_id=device.id, employee_id=employee.id, success=n % 2 == 0, created_date=day + timedelta(hours=n))
+        for n in range(3)
+    ])
+    await session.commit()
+    params = {'date_from': day.isoformat(), 'date_to': (day + timedelta(days=1)).isoformat()}
+
+    response = await authorized_superuser.get("/events/export", params=params)
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event['created_date'] for event in events] == [(day + timedelta(hours=n)).isoformat() for n in range(3)]
+    assert [event['success'] for event in events] == [True, False, True]
+
+    response = await authorized_superuser.get("/events/export", params={**params, 'format': 'csv', 'gzip': True})
+    assert response.headers['content-encoding'] == 'gzip'
+    rows = list(csv.reader(response.text.splitlines()))
+    assert rows[0] == ['id', 'device_id', 'employee_id', 'created_date', 'success']
+    assert rows[1:] == [[str(event['id']), str(device.id), str(employee.id), event['created_date'], str(event['success'])]
+                        for event in events]
@@ -0,0 +1,51 @@
+import re
+import pytest
+from httpx import AsyncClient
+from core.metrics import Histogram
+from models import Department
+from routers import department_router, metrics_router
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_server_timing(authorized_superuser: AsyncClient, department: Department) -> None:
+
+    response = await authorized_superuser.get(department_router.prefix)
+
+    assert response.status_code == 200
+    timing = re.fullmatch(r'db;dur=[\d.]+;desc="(\d+) statements", pool;dur=[\d.]+, app;dur=[\d.]+',
+                          response.headers['server-timing'])
+    assert int(timing.group(1)) >= 1
+
+
+async def test_metrics(authorized_superuser: AsyncClient, department: Department) -> None:
+
+    await authorized_superuser.get(department_router.prefix)
+
+    response = await authorized_superuser.get(metrics_router.prefix)
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    assert re.search(r'^http_request_duration_seconds_count\{method="GET",route="/departments",'
+                     r'status="200"\} [1-9]\d*$', response.text, re.MULTILINE)
+    assert re.search(r'^http_request_db_statements_count\{method="GET",route="/departments"\} '
+                     r'[1-9]\d*$', response.text, re.MULTILINE)
+    assert '# TYPE db_pool_checkout_wait_seconds histogram' in response.text
+    assert '# TYPE event_journal_dropped_events_total counter' in response.text
+
+
+def test_histogram_render():
+    histogram = Histogram('latency_seconds', 'Latency.', (0.1, 1), ('route',))
+    histogram.observe(0.05, '/a')
+    histogram.observe(0.5, '/a')
+    histogram.observe(5, '/a')
+
+    assert list(histogram.render()) == [
+        '# HELP latency_seconds Latency.',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 5.55',
+        'latency_seconds_count{route="/a"} 3',
+    ]
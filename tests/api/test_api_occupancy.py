@@ -0,0 +1,33 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Device, Employee
+from routers import occupancy_router
+
+url_prefix = occupancy_router.prefix
+pytestmark = pytest.mark.anyio
+
+
+async def test_get_occupancy(
+        authorized_superuser: AsyncClient,
+        employee: Employee,
+        device: Device,
+        session: AsyncSession) -> None:
+
+    device.employees = [employee]
+    session.add(device)
+    await session.commit()
+
+    response = await authorized_superuser.get(f"{url_prefix}")
+    assert response.json() == {'inside': 0, 'employee_ids': [], 'departments': {}}
+
+    await authorized_superuser.get(f"/drop_in/{employee.card_id}/{device.imei}")
+
+    response = await authorized_superuser.get(f"{url_prefix}")
+    assert response.status_code == 200
+    assert response.json() == {'inside': 1, 'employee_ids': [employee.id],
+                               'departments': {str(device.department_id): 1}}
+
+    response = await authorized_superuser.get(f"{url_prefix}/{device.department_id}")
+    assert response.status_code == 200
+    assert response.json() == {'department_id': device.department_id, 'inside': 1, 'employee_ids': [employee.id]}
@@ -0,0 +1,47 @@
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Device, Employee
+from routers import search_router
+
+url_prefix = search_router.prefix
+pytestmark = pytest.mark.anyio
+
+
+async def test_search(authorized_superuser: AsyncClient, department, session: AsyncSession) -> None:
+
+    session.add_all([
+        Employee(id=201, name='Sergei', surname='Yesenin', department_id=department.id, card_id=40401,
+                 card_start_date=date.today(), card_finish_date=date.today()),
+        Employee(id=202, name='Sergei', surname='Rachmaninoff', department_id=department.id, card_id=40402,
+                 card_start_date=date.today(), card_finish_date=date.today()),
+        Device(id=201, name='Yesenin hall reader', imei='860012345678901', route='enter',
+               department_id=department.id),
+    ])
+    await session.commit()
+
+    response = await authorized_superuser.get(f"{url_prefix}", params={'q': 'esenin'})
+    assert response.status_code == 200
+    assert sorted((item['kind'], item['id']) for item in response.json()) == [('device', 201), ('employee', 201)]
+
+    response = await authorized_superuser.get(f"{url_prefix}", params={'q': 'serg rach'})
+    assert response.json() == [{'kind': 'employee', 'id': 202, 'title': 'Sergei Rachmaninoff', 'detail': None}]
+
+    response = await authorized_superuser.get(f"{url_prefix}", params={'q': '12345'})
+    assert response.json() == [
+        {'kind': 'device', 'id': 201, 'title': 'Yesenin hall reader', 'detail': '860012345678901'}]
+
+    response = await authorized_superuser.patch("/employees/201", json={'surname': 'Blok'})
+    assert response.status_code == 200
+    response = await authorized_superuser.get(f"{url_prefix}", params={'q': 'esenin'})
+    assert [(item['kind'], item['id']) for item in response.json()] == [('device', 201)]
+
+    response = await authorized_superuser.get(f"{url_prefix}", params={'q': '"Sergei OR'})
+    assert response.status_code == 200
+    assert response.json() == []
+
+    response = await authorized_superuser.get(f"{url_prefix}", params={'q': 'a" OR b'})
+    assert response.status_code == 400
@@ -1,7 +1,9 @@
 import pytest
+from fastapi import FastAPI
 from httpx import AsyncClient
 from models import User
 from routers import user_router
+from services.principal_cache import principal_cache
 
 
 url_prefix = user_router.prefix
@@ -66,6 +68,32 @@ async def test_create_user(client: AsyncClient, status_code: int) -> None:
         assert response.json().get('email') == data['email']
 
 
+async def test_update_user_revokes_tokens(
+        test_app: FastAPI,
+        authorized_superuser: AsyncClient,
+        user3: User) -> None:
+
+    email = (await authorized_superuser.get(f"{url_prefix}/{user3.id}")).json()['email']
+    response = await authorized_superuser.post('/token', data={'username': email, 'password': 'user3'})
+    token = response.json()['access_token']
+
+    async with AsyncClient(app=test_app, base_url="http://localhost:8080",
+                           headers={"Authorization": f"Bearer {token}"}) as client:
+        await client.get(f"{url_prefix}")
+        assert principal_cache.get(token).id == user3.id
+
+        response = await authorized_superuser.patch(f"{url_prefix}/{user3.id}", json={'email': email})
+
+        assert response.status_code == 200
+        assert principal_cache.get(token) is None
+
+        principal_cache.clear()
+        response = await client.get(f"{url_prefix}")
+
+    assert response.status_code == 401
+    assert response.json()['detail'] == 'Token revoked'
+
+
 @pytest.mark.parametrize('client, status_code', [
     (pytest.lazy_fixture('authorized_not_superuser'), 403),
     (pytest.lazy_fixture('authorized_superuser'), 204),
@@ -1,5 +1,7 @@
 import pytest
 from httpx import AsyncClient
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
 from services.event_service import EventService
 
 pytestmark = pytest.mark.anyio
@@ -21,3 +23,48 @@ async def test_mock_ent_get(authorized_superuser: AsyncClient, monkeypatch):
     assert response.status_code == 200
     assert response.json() == data['Entry']
 
+
+async def mock_is_device_registered(self, imei):
+    return imei == '111111qwerty'
+
+
+async def mock_release(self):
+    pass
+
+
+async def test_mock_door_reader_channel(test_app, monkeypatch):
+
+    async def mock_check_entry_possibility(self, card_id, imei):
+        return {'entry': ('Admission are prohibited', 'Admission are permitted')[card_id == 1]}
+
+    monkeypatch.setattr(EventService, "is_device_registered", mock_is_device_registered)
+    monkeypatch.setattr(EventService, "check_entry_possibility", mock_check_entry_possibility)
+    monkeypatch.setattr(EventService, "release", mock_release)
+
+    with TestClient(test_app).websocket_connect("/drop_in/ws/111111qwerty") as websocket:
+        websocket.send_json({'card_id': 1})
+        assert websocket.receive_json() == {'card_id': 1, 'entry': 'Admission are permitted'}
+
+        websocket.send_json({'card_id': 2})
+        assert websocket.receive_json() == {'card_id': 2, 'entry': 'Admission are prohibited'}
+
+        websocket.send_text('not a frame')
+        assert websocket.receive_json() == {'error': 'Invalid frame'}
+
+        websocket.send_bytes(b'{"card_id": 1}')
+        assert websocket.receive_json() == {'error': 'Invalid frame'}
+
+        websocket.send_json({'card_id': 1})
+        assert websocket.receive_json() == {'card_id': 1, 'entry': 'Admission are permitted'}
+
+
+async def test_mock_door_reader_channel_unknown_device(test_app, monkeypatch):
+
+    monkeypatch.setattr(EventService, "is_device_registered", mock_is_device_registered)
+
+    with pytest.raises(WebSocketDisconnect) as excinfo:
+        with TestClient(test_app).websocket_connect("/drop_in/ws/unknown") as websocket:
+            websocket.receive_json()
+
+    assert excinfo.value.code == 1008
+
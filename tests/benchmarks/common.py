@@ -0,0 +1,107 @@
+"""Helpers shared by the benchmarks.
+
+Benchmarks run the application in-process against their own SQLite file,
+so ``use_database`` must be called before anything from the application
+is imported.
+"""
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+
+def use_database(path: str) -> None:
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+
+
+async def seed(employees: int, devices: int, grants_per_employee: int, rnd: random.Random) -> None:
+    """Recreate schema and fill it with a synthetic dataset.
+
+    Employee n holds card n + 1, device n has imei ``imei-<n + 1>``.
+    """
+
+    from sqlalchemy import insert
+    from core.database import async_engine
+    from models import Department, Device, Employee, access_control_table
+    from models.base_model import Base
+
+    departments = max(1, devices // 100)
+    today = date.today()
+
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+        await connection.execute(insert(Department), [
+            {"id": n + 1, "name": f"department-{n + 1}"} for n in range(departments)
+        ])
+        await connection.execute(insert(Device), [
+            {"id": n + 1, "name": f"reader-{n + 1}", "imei": f"imei-{n + 1}", "opened": False,
+             "route": ("enter", "exit")[n % 2], "department_id": n % departments + 1}
+            for n in range(devices)
+        ])
+        for start in range(0, employees, 5000):
+            stop = min(start + 5000, employees)
+            await connection.execute(insert(Employee), [
+                {"id": n + 1, "name": f"name-{n + 1}", "surname": f"surname-{n + 1}",
+                 "department_id": n % departments + 1, "card_id": n + 1,
+                 "card_start_date": today, "card_finish_date": today + timedelta(days=365)}
+                for n in range(start, stop)
+            ])
+            await connection.execute(insert(access_control_table), [
+                {"employee_id": n + 1, "device_id": device_id + 1}
+                for n in range(start, stop)
+                for device_id in rnd.sample(range(devices), min(grants_per_employee, devices))
+            ])
+
+
+async def run_load(
+    request: Callable[[int], Awaitable[None]], total: int, concurrency: int
+) -> tuple[List[float], float, int]:
+    """Call request(n) total times from concurrency workers.
+
+    Returns latencies in seconds, elapsed wall time and number of errors.
+    """
+
+    counter = iter(range(total))
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for n in counter:
+            started = time.perf_counter()
+            try:
+                await request(n)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started, errors
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int) -> dict:
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+    }
+
+
+def write_report(path: str, report: dict) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(report, indent=2))
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,76 @@
+"""Throughput and latency of /drop_in/{card_id}/{imei}.
+
+Seeds a synthetic dataset, drives the endpoint in-process through httpx's
+ASGI transport and writes throughput and p50/p95/p99 latency to a JSON file:
+
+    python -m tests.benchmarks.drop_in_benchmark --employees 100000 --devices 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import random
+
+from tests.benchmarks.common import use_database, seed, run_load, summarize, write_report
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="benchmark.db", help="SQLite file used by the benchmark")
+    parser.add_argument("--reuse", action="store_true", help="do not reseed an existing database")
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--devices", type=int, default=2_000)
+    parser.add_argument("--grants-per-employee", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--warmup", type=int, default=1_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--unknown-card-ratio", type=float, default=0.05,
+                        help="share of swipes with a card that is not in the database")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results/drop_in.json")
+    return parser.parse_args(argv)
+
+
+async def drop_in_load(args: argparse.Namespace, rnd: random.Random, total: int) -> dict:
+    """Drive /drop_in with the running application and return the latency summary."""
+
+    from httpx import ASGITransport, AsyncClient
+    from main import app
+
+    swipes = [
+        (rnd.randint(1, args.employees) if rnd.random() >= args.unknown_card_ratio else -n,
+         f"imei-{rnd.randint(1, args.devices)}")
+        for n in range(total)
+    ]
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+
+        async def request(n: int) -> None:
+            card_id, imei = swipes[n]
+            response = await client.get(f"/drop_in/{card_id}/{imei}")
+            response.raise_for_status()
+
+        return summarize(*await run_load(request, total, args.concurrency))
+
+
+async def main(args: argparse.Namespace) -> dict:
+    rnd = random.Random(args.seed)
+    if not args.reuse:
+        await seed(args.employees, args.devices, args.grants_per_employee, rnd)
+
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        if args.warmup:
+            await drop_in_load(args, rnd, args.warmup)
+        result = await drop_in_load(args, rnd, args.requests)
+
+    return {
+        "benchmark": "drop_in",
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+        "result": result,
+    }
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    use_database(arguments.database)
+    write_report(arguments.output, asyncio.run(main(arguments)))
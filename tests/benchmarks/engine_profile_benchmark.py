@@ -0,0 +1,77 @@
+"""Swipe throughput of /drop_in/{card_id}/{imei} across engine profiles.
+
+Every profile is a set of DATABASE_* / SQLITE_* settings. The drop_in
+benchmark is run once per profile in its own process against the same
+seeded database, and the summaries are collected into one JSON file:
+
+    python -m tests.benchmarks.engine_profile_benchmark --employees 100000 --devices 2000
+    python -m tests.benchmarks.engine_profile_benchmark --profiles untuned tuned
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from tests.benchmarks.common import write_report
+
+UNTUNED = {
+    "DATABASE_ECHO": "false",
+    "DATABASE_POOL_SIZE": "0",
+    "SQLITE_JOURNAL_MODE": "DELETE",
+    "SQLITE_SYNCHRONOUS": "FULL",
+    "SQLITE_MMAP_SIZE": "0",
+    "SQLITE_CACHE_SIZE": "-2000",
+}
+
+PROFILES = {
+    "echo": {**UNTUNED, "DATABASE_ECHO": "true"},
+    "untuned": UNTUNED,
+    "pooled": {**UNTUNED, "DATABASE_POOL_SIZE": "5", "DATABASE_MAX_OVERFLOW": "10"},
+    "wal": {**UNTUNED, "SQLITE_JOURNAL_MODE": "WAL", "SQLITE_SYNCHRONOUS": "NORMAL"},
+    "tuned": {},
+}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="benchmark.db", help="SQLite file used by the benchmark")
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=list(PROFILES))
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--devices", type=int, default=2_000)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results/engine_profiles.json")
+    return parser.parse_args(argv)
+
+
+def run_profile(args: argparse.Namespace, name: str, reuse: bool) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        output = Path(directory) / f"{name}.json"
+        command = [
+            sys.executable, "-m", "tests.benchmarks.drop_in_benchmark",
+            "--database", args.database, "--employees", str(args.employees), "--devices", str(args.devices),
+            "--requests", str(args.requests), "--concurrency", str(args.concurrency),
+            "--seed", str(args.seed), "--output", str(output),
+        ]
+        if reuse:
+            command.append("--reuse")
+        subprocess.run(command, env={**os.environ, **PROFILES[name]}, stdout=subprocess.DEVNULL, check=True)
+        return json.loads(output.read_text())["result"]
+
+
+def main(args: argparse.Namespace) -> dict:
+    return {
+        "benchmark": "engine_profiles",
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+        "profiles": {name: PROFILES[name] for name in args.profiles},
+        "result": {name: run_profile(args, name, reuse=n > 0) for n, name in enumerate(args.profiles)},
+    }
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    write_report(arguments.output, main(arguments))
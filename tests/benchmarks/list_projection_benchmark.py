@@ -0,0 +1,87 @@
+"""Cost of one page of GET /employees with whole entities vs projected columns.
+
+Walks the employee list page by page twice: loading Employee entities and
+validating them against EmployeePostSchema the way a response_model does,
+and selecting only the schema's columns into employee_rows. Time and peak
+allocated memory per page are written to a JSON file:
+
+    python -m tests.benchmarks.list_projection_benchmark --employees 100000 --page-size 1000
+"""
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+
+from tests.benchmarks.common import use_database, seed, summarize, write_report
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="benchmark.db", help="SQLite file used by the benchmark")
+    parser.add_argument("--reuse", action="store_true", help="do not reseed an existing database")
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--devices", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results/list_projection.json")
+    return parser.parse_args(argv)
+
+
+async def walk(args: argparse.Namespace, projected: bool) -> dict:
+    from typing import List
+    from pydantic import TypeAdapter
+    from core.database import async_session
+    from repository import EmployeeRepository
+    from schemas.employee_schema import EmployeePostSchema, employee_rows
+
+    entities = TypeAdapter(List[EmployeePostSchema])
+    fields = employee_rows.fields if projected else None
+    latencies, peaks, after = [], [], None
+    started = time.perf_counter()
+
+    for _ in range(args.pages):
+        async with async_session() as session:
+            repository = EmployeeRepository(session)
+            tracemalloc.start()
+            page_started = time.perf_counter()
+
+            items = await repository.list_after(args.page_size, after, "id", fields)
+            if projected:
+                body = employee_rows.dump_json(items)
+            else:
+                body = entities.dump_json(entities.validate_python(items, from_attributes=True))
+
+            latencies.append(time.perf_counter() - page_started)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            after = repository.cursor(items[-1]) if items else None
+        assert body
+
+    return {
+        **summarize(latencies, time.perf_counter() - started, 0),
+        "peak_memory_kib_max": round(max(peaks) / 1024, 1),
+        "peak_memory_kib_mean": round(sum(peaks) / len(peaks) / 1024, 1),
+    }
+
+
+async def main(args: argparse.Namespace) -> dict:
+    if not args.reuse:
+        await seed(args.employees, args.devices, 1, random.Random(args.seed))
+
+    await walk(args, projected=True)
+    return {
+        "benchmark": "list_projection",
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+        "result": {
+            "entities": await walk(args, projected=False),
+            "projected": await walk(args, projected=True),
+        },
+    }
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    use_database(arguments.database)
+    write_report(arguments.output, asyncio.run(main(arguments)))
@@ -0,0 +1,95 @@
+"""Latency of /drop_in/{card_id}/{imei} while a burst of logins is in progress.
+
+Runs the same swipe load twice, alone and next to concurrent POST /token
+requests, and writes both latency summaries to a JSON file. With password
+hashing off the event loop the two swipe summaries stay close:
+
+    python -m tests.benchmarks.login_burst_benchmark --logins 50 --login-concurrency 10
+    python -m tests.benchmarks.login_burst_benchmark --hashing-executor thread
+"""
+import argparse
+import asyncio
+import os
+import random
+
+from tests.benchmarks.common import use_database, seed, run_load, summarize, write_report
+
+EMAIL = "benchmark@example.com"
+PASSWORD = "benchmark"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="benchmark.db", help="SQLite file used by the benchmark")
+    parser.add_argument("--reuse", action="store_true", help="do not reseed an existing database")
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--devices", type=int, default=200)
+    parser.add_argument("--grants-per-employee", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--login-concurrency", type=int, default=10)
+    parser.add_argument("--hashing-executor", choices=("process", "thread"), default="process")
+    parser.add_argument("--hashing-workers", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results/login_burst.json")
+    return parser.parse_args(argv)
+
+
+async def add_user() -> None:
+    from core.database import async_session
+    from models import User
+    from services.user_service import HashingMixin
+
+    async with async_session() as session:
+        session.add(User(email=EMAIL, hashed_password=HashingMixin.get_password_hash(PASSWORD), is_superuser=True))
+        await session.commit()
+
+
+async def main(args: argparse.Namespace) -> dict:
+    rnd = random.Random(args.seed)
+    if not args.reuse:
+        await seed(args.employees, args.devices, args.grants_per_employee, rnd)
+        await add_user()
+
+    from httpx import ASGITransport, AsyncClient
+    from main import app
+
+    swipes = [(rnd.randint(1, args.employees), f"imei-{rnd.randint(1, args.devices)}") for _ in range(args.requests)]
+
+    async with app.router.lifespan_context(app), \
+            AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+
+        async def swipe(n: int) -> None:
+            card_id, imei = swipes[n]
+            response = await client.get(f"/drop_in/{card_id}/{imei}")
+            response.raise_for_status()
+
+        async def login(n: int) -> None:
+            response = await client.post("/token", data={"username": EMAIL, "password": PASSWORD})
+            response.raise_for_status()
+
+        await run_load(login, args.login_concurrency, args.login_concurrency)
+        alone = summarize(*await run_load(swipe, args.requests, args.concurrency))
+        during_logins, logins = await asyncio.gather(
+            run_load(swipe, args.requests, args.concurrency),
+            run_load(login, args.logins, args.login_concurrency),
+        )
+
+    return {
+        "benchmark": "login_burst",
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+        "result": {
+            "swipes_alone": alone,
+            "swipes_during_logins": summarize(*during_logins),
+            "logins": summarize(*logins),
+        },
+    }
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    use_database(arguments.database)
+    os.environ["PASSWORD_HASHING_EXECUTOR"] = arguments.hashing_executor
+    os.environ["PASSWORD_HASHING_WORKERS"] = str(arguments.hashing_workers)
+    write_report(arguments.output, asyncio.run(main(arguments)))
@@ -1,3 +1,4 @@
+from contextlib import nullcontext
 from typing import TypeVar, Any, Callable, AsyncGenerator, NamedTuple
 from datetime import date
 import pytest
@@ -10,8 +11,11 @@ from httpx import AsyncClient
 from models.base_model import Base
 from models import Department, Employee, Device, User
 from repository.repository_meta import RepositoryMeta
-from schemas.device_schema import DeviceEmployeePostRequestSchema
+from schemas.device_schema import DeviceAccessSchema
 from services import DeviceService
+from services.access_index import access_index
+from services.occupancy import occupancy
+from services.principal_cache import principal_cache
 from services.user_service import HashingMixin
 
 DATABASE_URL = "sqlite+aiosqlite:///async_test.db"
@@ -25,6 +29,13 @@ def anyio_backend():
     return 'asyncio'
 
 
+@pytest.fixture(autouse=True)
+def clear_in_memory_state():
+    access_index.clear()
+    occupancy.clear()
+    principal_cache.clear()
+
+
 @pytest.fixture(scope='module')
 async def session(anyio_backend) -> AsyncSession:
     async with async_engine.begin() as connection:
@@ -191,11 +202,18 @@ class FakeRepository(RepositoryMeta):
 
     def __init__(self, items: list = None) -> None:
         self._items = (items, [])[items is None]
+        self.bumped_versions = []
 
     @property
     def items(self):
         return self._items
 
+    def unit_of_work(self):
+        return nullcontext()
+
+    async def bump_version(self, table: str) -> None:
+        self.bumped_versions.append(table)
+
     async def create(self, item: ModelType) -> ModelType:
         for obj in self._items:
             for field in self.unique_field:
@@ -227,7 +245,7 @@ class FakeRepository(RepositoryMeta):
     async def delete(self, item: ModelType) -> None:
         self._items.remove(item)
 
-    async def list(self, page_size: int, start_index: int):
+    async def list(self, page_size: int, start_index: int, fields=None, filters=None):
         return self._items[start_index:page_size]
 
 
@@ -235,16 +253,82 @@ class FakeRepository(RepositoryMeta):
 class FakeDepartmentRepository(FakeRepository):
     unique_field = 'name',
 
+    async def get_existing_ids(self, department_ids) -> set:
+        return {department.id for department in self._items if department.id in department_ids}
+
+
+class AccessDecision(NamedTuple):
+    employee_id: int
+    card_start_date: date
+    card_finish_date: date
+    device_id: int | None
+    opened: bool | None
+    department_id: int | None
+    route: str | None
+    allowed: bool
+
 
 @pytest.mark.usefixtures("anyio_backend")
 class FakeEmployeeRepository(FakeRepository):
     unique_field = "card_id",
 
+    def __init__(self, items: list = None, devices: list = None) -> None:
+        super().__init__(items)
+        self.devices = (devices, [])[devices is None]
+
     async def get_by_card_id(self, card_id: int) -> Employee:
         for employee in self._items:
             if getattr(employee, 'card_id') == card_id:
                 return employee
 
+    async def get_by_card_ids(self, card_ids) -> list:
+        return [employee for employee in self._items if employee.card_id in card_ids]
+
+    async def grant_access(self, device_ids, employee_ids=(), department_id=None) -> set:
+        granted = set()
+        for employee in self._access_employees(employee_ids, department_id):
+            for device in self.devices:
+                if device.id in device_ids and device not in employee.devices:
+                    employee.devices.append(device)
+                    granted.add((employee.id, device.id))
+        return granted
+
+    async def revoke_access(self, device_ids, employee_ids=(), department_id=None) -> set:
+        revoked = set()
+        for employee in self._access_employees(employee_ids, department_id):
+            for device in list(employee.devices):
+                if device.id in device_ids:
+                    employee.devices.remove(device)
+                    revoked.add((employee.id, device.id))
+        return revoked
+
+    def _access_employees(self, employee_ids, department_id) -> list:
+        if department_id is not None:
+            return [employee for employee in self._items if employee.department_id == department_id]
+        return [employee for employee in self._items if employee.id in employee_ids]
+
+    async def create_many(self, items: list) -> None:
+        next_id = max((employee.id for employee in self._items), default=0) + 1
+        self._items.extend(Employee(id=next_id + n, **item) for n, item in enumerate(items))
+
+    async def record_card_changes(self, card_ids) -> None:
+        pass
+
+    async def get_access_pairs(self, employee_ids, device_ids) -> set:
+        return {(employee.id, device.id) for employee in self._items for device in employee.devices
+                if employee.id in employee_ids and device.id in device_ids}
+
+    async def get_access_decision(self, card_id: int, imei: str) -> AccessDecision | None:
+        employee = await self.get_by_card_id(card_id)
+        if not employee:
+            return
+        device = next((device for device in self.devices if device.imei == imei), None)
+        return AccessDecision(
+            employee.id, employee.card_start_date, employee.card_finish_date,
+            device and device.id, device and device.opened, device and device.department_id, device and device.route,
+            bool(device and device in employee.devices)
+        )
+
     async def update(self, item: ModelType) -> ModelType:
 
         class UniqueErrorOrig:
@@ -273,11 +357,20 @@ class FakeDeviceRepository(FakeRepository):
             if getattr(device, 'imei') == imei:
                 return Device(id=device.id, opened=device.opened)
 
+    async def get_by_imeis(self, imeis) -> list:
+        return [device for device in self._items if device.imei in imeis]
+
+    async def record_access_list_reset(self, device_id: int) -> None:
+        pass
+
 
 @pytest.mark.usefixtures("anyio_backend")
 class FakeEventRepository(FakeRepository):
     unique_field = tuple()
 
+    async def create_many(self, items: list) -> None:
+        self._items.extend(items)
+
 
 @pytest.mark.usefixtures("anyio_backend")
 class FakeUserRepository(FakeRepository):
@@ -285,8 +378,13 @@ class FakeUserRepository(FakeRepository):
 
 
 @pytest.fixture(scope='module', name='fake_employee_repository')
-def get_employee_repository(anyio_backend, employees) -> FakeRepository:
-    return FakeEmployeeRepository(employees)
+def get_employee_repository(anyio_backend, employees, devices) -> FakeRepository:
+    return FakeEmployeeRepository(employees, devices)
+
+
+@pytest.fixture(name='empty_employee_repository')
+def get_empty_employee_repository(anyio_backend) -> FakeRepository:
+    return FakeEmployeeRepository()
 
 
 @pytest.fixture(scope='module', name='fake_department_repository')
@@ -337,8 +435,8 @@ async def add_record_in_access_control_table(
     first_device = fake_device_repository.items[0]
     first_employee = fake_employee_repository.items[0]
 
-    data = {'device_id': first_device.id, 'employee_id': first_employee.id}
+    data = {'device_ids': [first_device.id], 'employee_ids': [first_employee.id]}
 
-    await device_service.add_employee(DeviceEmployeePostRequestSchema(**data))
+    await device_service.grant_access(DeviceAccessSchema(**data))
     return BoundDataAccessControlTable(first_employee, first_device, device_service)
 
@@ -0,0 +1,67 @@
+from datetime import date, datetime
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Department, Device, Employee, Event
+from repository import AttendanceRepository, EventRepository
+
+pytestmark = pytest.mark.anyio
+
+day = date(2024, 1, 10)
+
+
+@pytest.fixture(name='exit_device', scope='module')
+async def insert_exit_device(anyio_backend, session, department) -> Device:
+    device = Device(id=2, name='Contact reader №2', imei='222222qwerty',
+                    route='exit', department_id=department.id)
+    session.add(device)
+    await session.commit()
+    return device
+
+
+async def test_events_are_rolled_up(
+        session: AsyncSession, employee: Employee, device: Device, exit_device: Device):
+
+    await EventRepository(session).create_many([
+        Event(device_id=device.id, employee_id=employee.id, success=True, created_date=datetime(2024, 1, 10, 9)),
+        Event(device_id=exit_device.id, employee_id=employee.id, success=True, created_date=datetime(2024, 1, 10, 13)),
+        Event(device_id=device.id, employee_id=employee.id, success=False, created_date=datetime(2024, 1, 10, 8)),
+    ])
+    await EventRepository(session).create(
+        Event(device_id=exit_device.id, employee_id=employee.id, success=True, created_date=datetime(2024, 1, 10, 18)))
+
+    rollups = await AttendanceRepository(session).list(10, date_from=day, date_to=day)
+
+    assert [(r.employee_id, r.day, r.first_entry, r.last_exit) for r in rollups] == [
+        (employee.id, day, datetime(2024, 1, 10, 9), datetime(2024, 1, 10, 18))
+    ]
+
+
+async def test_rebuild(session: AsyncSession, employee: Employee, device: Device):
+
+    session.add(Event(device_id=device.id, employee_id=employee.id, success=True,
+                      created_date=datetime(2024, 1, 10, 7)))
+    await session.commit()
+
+    await AttendanceRepository(session).rebuild(day, day)
+    rollups = await AttendanceRepository(session).list(10, date_from=day, date_to=day)
+
+    assert [(r.first_entry, r.last_exit) for r in rollups] == [
+        (datetime(2024, 1, 10, 7), datetime(2024, 1, 10, 18))
+    ]
+
+
+async def test_list_after(session: AsyncSession, department: Department, employee: Employee, device: Device):
+
+    other = Employee(name='Jane', surname='Austen', department_id=department.id, card_id=2222222,
+                     card_start_date=day, card_finish_date=day)
+    session.add(other)
+    await session.commit()
+    await EventRepository(session).create(
+        Event(device_id=device.id, employee_id=other.id, success=True, created_date=datetime(2024, 1, 10, 10)))
+
+    repo = AttendanceRepository(session)
+    first_page = await repo.list(1, date_from=day, date_to=day)
+    second_page = await repo.list(1, (first_page[-1].day, first_page[-1].employee_id), date_from=day, date_to=day)
+
+    assert [r.employee_id for r in first_page + second_page] == [employee.id, other.id]
@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import exc, select, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from core.database import create_engine, create_sessionmaker, read_url
+from repository.unit_of_work import UnitOfWork
+from core.environment import settings
+from models import Department
+from models.base_model import Base
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_sqlite_pragmas_are_applied(tmp_path):
+    config = settings.model_copy(update={'DATABASE_URL': f"sqlite+aiosqlite:///{tmp_path / 'pragmas.db'}"})
+    engine = create_engine(config)
+
+    async with engine.connect() as connection:
+        pragmas = {name: (await connection.execute(text(f"PRAGMA {name}"))).scalar()
+                   for name in ('journal_mode', 'synchronous', 'cache_size', 'busy_timeout')}
+    await engine.dispose()
+
+    assert isinstance(engine.pool, AsyncAdaptedQueuePool)
+    assert pragmas == {'journal_mode': 'wal', 'synchronous': 1,
+                       'cache_size': config.SQLITE_CACHE_SIZE, 'busy_timeout': config.SQLITE_BUSY_TIMEOUT_MS}
+
+
+async def test_engine_without_pool(tmp_path):
+    config = settings.model_copy(update={'DATABASE_URL': f"sqlite+aiosqlite:///{tmp_path / 'nopool.db'}",
+                                         'DATABASE_POOL_SIZE': 0, 'SQLITE_JOURNAL_MODE': ''})
+    engine = create_engine(config)
+
+    async with engine.connect() as connection:
+        journal_mode = (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+    await engine.dispose()
+
+    assert isinstance(engine.pool, NullPool)
+    assert journal_mode == 'delete'
+
+
+async def test_reads_are_routed_to_read_engine(tmp_path):
+    config = settings.model_copy(update={'DATABASE_URL': f"sqlite+aiosqlite:///{tmp_path / 'routing.db'}"})
+    engine = create_engine(config)
+    read_engine = create_engine(config, read_url(config))
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with create_sessionmaker(engine, read_engine)() as session:
+        read = select(Department)
+        assert session.sync_session.get_bind(clause=read) is read_engine.sync_engine
+
+        session.add(Department(name='dep1'))
+        assert (await session.execute(read)).scalar_one().name == 'dep1'
+        assert session.sync_session.get_bind(clause=read) is engine.sync_engine
+
+        await session.commit()
+        assert session.sync_session.get_bind(clause=read) is read_engine.sync_engine
+        assert (await session.execute(read)).scalar_one().name == 'dep1'
+
+        async with UnitOfWork(session):
+            assert session.sync_session.get_bind(clause=read) is engine.sync_engine
+        assert session.sync_session.get_bind(clause=read) is read_engine.sync_engine
+
+    async with read_engine.connect() as connection:
+        with pytest.raises(exc.OperationalError):
+            await connection.execute(text("DELETE FROM departments"))
+
+    await engine.dispose()
+    await read_engine.dispose()
+
+
+def test_read_url():
+    sqlite_config = settings.model_copy(update={'DATABASE_URL': "sqlite+aiosqlite:///example.db"})
+
+    assert read_url(sqlite_config).render_as_string() == "sqlite+aiosqlite:///file:example.db?mode=ro&uri=true"
+    assert read_url(sqlite_config.model_copy(update={'DATABASE_READ_ROUTING': False})) is None
+    assert read_url(sqlite_config.model_copy(update={'DATABASE_URL': "sqlite+aiosqlite://"})) is None
+    assert read_url(sqlite_config.model_copy(
+        update={'DATABASE_READ_URL': "sqlite+aiosqlite:///replica.db"})).database == "replica.db"
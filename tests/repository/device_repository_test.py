@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from models import Device, Department
-from repository import DeviceRepository
+from repository import DeviceRepository, EmployeeRepository
 
 pytestmark = pytest.mark.anyio
 
@@ -87,3 +87,22 @@ async def test_get_device_id_and_device_opened(session: AsyncSession, device: De
     assert retrieved_device.opened == device.opened
 
 
+
+
+async def test_device_repository_access_list_changes(session: AsyncSession, device: Device, employee):
+
+    repo = DeviceRepository(session)
+    employee_repo = EmployeeRepository(session)
+    version = await repo.get_access_list_version()
+
+    await employee_repo.grant_access([device.id], [employee.id])
+    await employee_repo.record_card_changes([99999999])
+    assert await repo.get_access_list_changes(device.id, version) == (False, {employee.card_id, 99999999})
+    assert [row.card_id for row in await repo.get_access_list(device.id, False, version)] == [employee.card_id]
+
+    await employee_repo.revoke_access([device.id], [employee.id])
+    assert await repo.get_access_list(device.id, False) == []
+
+    await repo.record_access_list_reset(device.id)
+    assert (await repo.get_access_list_changes(device.id, version))[0]
+    assert await repo.get_access_list_changes(device.id + 1, version) == (False, {99999999})
@@ -1,9 +1,11 @@
+import json
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date, datetime
-from sqlalchemy import select
-from models import Employee, Department
+from sqlalchemy import select, insert
+from models import Employee, Department, Device, access_control_table
 from repository import EmployeeRepository
+from schemas.employee_schema import EmployeeFilterSchema, employee_rows
 
 pytestmark = pytest.mark.anyio
 
@@ -99,4 +101,119 @@ async def test_employee_repository_can_create(session: AsyncSession, department:
     assert retrieved_employee.card_finish_date == date.today()
 
 
+async def test_get_access_decision(session: AsyncSession, department: Department):
+    employee = Employee(name='Jane', surname='Austen', department_id=department.id, card_id=9999999,
+                        card_start_date=date.today(), card_finish_date=date.today())
+    device = Device(name='Contact reader №9', imei='999999qwerty', route='enter', department_id=department.id)
+    session.add_all([employee, device])
+    await session.commit()
+
+    repo = EmployeeRepository(session)
+
+    denied = await repo.get_access_decision(employee.card_id, device.imei)
+    assert denied.employee_id == employee.id
+    assert denied.device_id == device.id
+    assert denied.opened is False
+    assert denied.card_finish_date == employee.card_finish_date
+    assert denied.allowed is False
+
+    await session.execute(insert(access_control_table).values(employee_id=employee.id, device_id=device.id))
+    await session.commit()
+
+    allowed = await repo.get_access_decision(employee.card_id, device.imei)
+    assert allowed.allowed is True
+
+    unknown_device = await repo.get_access_decision(employee.card_id, 'unknown')
+    assert unknown_device.employee_id == employee.id
+    assert unknown_device.device_id is None
+    assert unknown_device.allowed is False
+
+    assert await repo.get_access_decision(-1, device.imei) is None
+
+
+async def test_grant_and_revoke_access(session: AsyncSession, department: Department):
+    other_department = Department(name='grant_department')
+    session.add(other_department)
+    await session.flush()
+    employees = [
+        Employee(name='Ivan', surname='Bunin', department_id=other_department.id, card_id=8888801,
+                 card_start_date=date.today(), card_finish_date=date.today()),
+        Employee(name='Boris', surname='Pasternak', department_id=other_department.id, card_id=8888802,
+                 card_start_date=date.today(), card_finish_date=date.today()),
+        Employee(name='Anna', surname='Akhmatova', department_id=department.id, card_id=8888803,
+                 card_start_date=date.today(), card_finish_date=date.today()),
+    ]
+    devices = [
+        Device(name=f'Contact reader №8{n}', imei=f'88888{n}qwerty', route='enter', department_id=department.id)
+        for n in range(2)
+    ]
+    session.add_all([*employees, *devices])
+    await session.commit()
+    device_ids = [device.id for device in devices]
+
+    repo = EmployeeRepository(session)
+
+    granted = await repo.grant_access(device_ids, department_id=other_department.id)
+    assert granted == {(employee.id, device_id) for employee in employees[:2] for device_id in device_ids}
+
+    granted = await repo.grant_access(device_ids, [employees[0].id, employees[2].id, -1])
+    assert granted == {(employees[2].id, device_id) for device_id in device_ids}
+
+    revoked = await repo.revoke_access([device_ids[0]], department_id=other_department.id)
+    assert revoked == {(employees[0].id, device_ids[0]), (employees[1].id, device_ids[0])}
+
+    revoked = await repo.revoke_access(device_ids, [employees[2].id])
+    assert revoked == {(employees[2].id, device_id) for device_id in device_ids}
+    await session.commit()
+
+    result = await session.execute(
+        select(access_control_table.c.employee_id, access_control_table.c.device_id)
+        .where(access_control_table.c.device_id.in_(device_ids)))
+    assert set(result.all()) == {(employees[0].id, device_ids[1]), (employees[1].id, device_ids[1])}
+
+
+async def test_list_after_projects_fields(session: AsyncSession, department: Department):
+    session.add(Employee(name='Ivan', surname='Goncharov', department_id=department.id, card_id=99999999,
+                         card_start_date=date(2024, 1, 1), card_finish_date=date(2024, 12, 31)))
+    await session.commit()
+
+    repo = EmployeeRepository(session)
+    rows = await repo.list_after(1, sort='-card_id', fields=employee_rows.fields)
+
+    assert json.loads(employee_rows.dump_json(rows)) == [{
+        'name': 'Ivan', 'surname': 'Goncharov', 'department_id': department.id, 'card_start_date': '2024-01-01',
+        'card_finish_date': '2024-12-31', 'card_id': 99999999, 'id': rows[0].id,
+    }]
+    assert repo.cursor(rows[0], '-card_id') == repo.cursor(await repo.get(rows[0].id), '-card_id')
+
+
+async def test_list_after_filters(session: AsyncSession, department: Department):
+    other_department = Department(name='filter_department')
+    session.add(other_department)
+    await session.flush()
+    employees = [
+        Employee(name='Marina', surname='Tsvetaeva', department_id=other_department.id, card_id=6666601,
+                 card_start_date=date(2024, 1, 1), card_finish_date=date(2024, 3, 1)),
+        Employee(name='Mariya', surname='Petrovykh', department_id=other_department.id, card_id=6666602,
+                 card_start_date=date(2024, 1, 1), card_finish_date=date(2024, 6, 1)),
+        Employee(name='Osip', surname='Mandelstam', department_id=other_department.id, card_id=6666603,
+                 card_start_date=date(2024, 1, 1), card_finish_date=date(2024, 3, 15)),
+    ]
+    device = Device(name='Contact reader №66', imei='666666qwerty', route='enter', department_id=department.id)
+    session.add_all([*employees, device])
+    await session.flush()
+    await session.execute(insert(access_control_table).values(employee_id=employees[2].id, device_id=device.id))
+    await session.commit()
+
+    repo = EmployeeRepository(session)
+
+    async def card_ids(**filters) -> list:
+        found = await repo.list_after(10, filters=EmployeeFilterSchema(department_id=other_department.id, **filters))
+        return [employee.card_id for employee in found]
 
+    assert await card_ids() == [6666601, 6666602, 6666603]
+    assert await card_ids(name_prefix='Mari') == [6666601, 6666602]
+    assert await card_ids(name_prefix='Marin') == [6666601]
+    assert await card_ids(surname_prefix='Man') == [6666603]
+    assert await card_ids(card_expires_from=date(2024, 3, 1), card_expires_to=date(2024, 3, 31)) == [6666601, 6666603]
+    assert await card_ids(device_id=device.id) == [6666603]
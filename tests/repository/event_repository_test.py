@@ -1,3 +1,4 @@
+from datetime import datetime
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -20,4 +21,48 @@ async def test_device_repository_can_create(session: AsyncSession, device: Devic
     assert retrieved_event.success == new_event.success
 
 
+@pytest.mark.anyio
+async def test_event_repository_can_create_many(session: AsyncSession, device: Device, employee: Employee):
+    new_events = [
+        Event(device_id=device.id, employee_id=employee.id, success=True, created_date=datetime(2024, 1, 1, 9)),
+        Event(device_id=device.id, employee_id=employee.id, success=False, created_date=datetime(2024, 1, 1, 10)),
+    ]
+
+    repo = EventRepository(session)
+    await repo.create_many(new_events)
+
+    res = await session.execute(select(Event).where(Event.created_date < datetime(2024, 1, 2)))
+    retrieved_events = res.scalars().all()
+
+    assert [event.success for event in retrieved_events] == [True, False]
+    assert [event.created_date for event in retrieved_events] == [event.created_date for event in new_events]
+
+
+@pytest.mark.anyio
+async def test_event_repository_can_stream(session: AsyncSession, device: Device, employee: Employee):
+    day = datetime(2018, 1, 1)
+    session.add_all([
+        Event(device_id=device.id, employee_id=employee.id, success=True, created_date=day.replace(hour=n))
+        for n in range(5)
+    ])
+    await session.commit()
+
+    repo = EventRepository(session)
+    chunks = [rows async for rows in repo.stream(2, date_from=day, date_to=day.replace(day=2))]
+
+    assert [len(rows) for rows in chunks] == [2, 2, 1]
+    assert [row.created_date.hour for rows in chunks for row in rows] == list(range(5))
+
+
+@pytest.mark.anyio
+async def test_event_repository_get_last_swipes(session: AsyncSession, device: Device, employee: Employee):
+    repo = EventRepository(session)
+    await repo.create_many([
+        Event(device_id=device.id, employee_id=employee.id, success=True, created_date=datetime(2030, 1, 1, 9)),
+        Event(device_id=device.id, employee_id=employee.id, success=False, created_date=datetime(2030, 1, 1, 10)),
+    ])
+
+    swipes = await repo.get_last_swipes()
 
+    assert [tuple(swipe) for swipe in swipes] == [
+        (employee.id, device.department_id, device.route, datetime(2030, 1, 1, 9))]
@@ -0,0 +1,43 @@
+from datetime import date
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Device, Department, Employee
+from repository import SearchRepository
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_search_follows_device_changes(session: AsyncSession, department: Department):
+    device = Device(name='Turnstile north', imei='350000111122223', route='enter', department_id=department.id)
+    session.add(device)
+    await session.commit()
+
+    repo = SearchRepository(session)
+    assert [(row.kind, row.id, row.detail) for row in await repo.search('"stile"', 10)] == [
+        ('device', device.id, '350000111122223')]
+
+    device.name = 'Gate north'
+    await session.commit()
+    assert await repo.search('"stile"', 10) == []
+    assert [row.title for row in await repo.search('"gate" "nor"', 10)] == ['Gate north']
+
+    await session.delete(device)
+    await session.commit()
+    assert await repo.search('"gate"', 10) == []
+
+
+async def test_search_scores_kinds_relative_to_their_best(session: AsyncSession, department: Department):
+    session.add_all([
+        Device(name='Gate alpha', imei='350000333344445', route='enter', department_id=department.id),
+        Device(name='Gate alpha annex gate', imei='350000333344446', route='exit', department_id=department.id),
+        Employee(id=500, name='Alpha', surname='Gatewood', department_id=department.id, card_id=50000,
+                 card_start_date=date.today(), card_finish_date=date.today()),
+    ])
+    await session.commit()
+
+    rows = await SearchRepository(session).search('"alpha"', 10)
+
+    assert sorted(row.score for row in rows)[-2:] == [1, 1]
+    assert {row.kind for row in rows if row.score == 1} == {'device', 'employee'}
+    assert all(0 < row.score <= 1 for row in rows)
@@ -0,0 +1,17 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from repository import TableVersionRepository
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bump(session: AsyncSession):
+    repo = TableVersionRepository(session)
+    version = await repo.get("employees")
+
+    await repo.bump("employees")
+    await repo.bump("employees")
+
+    assert await repo.get("employees") == version + 2
+    assert await repo.get("unknown") == 0
@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import select
+
+from core.database import create_engine, create_sessionmaker
+from core.environment import settings
+from models import Department
+from models.base_model import Base
+from repository import DepartmentRepository
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def sessionmaker(tmp_path):
+    engine = create_engine(settings.model_copy(
+        update={'DATABASE_URL': f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}", 'DATABASE_READ_ROUTING': False}))
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield create_sessionmaker(engine)
+    await engine.dispose()
+
+
+async def names(sessionmaker) -> list:
+    async with sessionmaker() as session:
+        return list((await session.execute(select(Department.name).order_by(Department.name))).scalars())
+
+
+async def test_commit_once_at_the_end(sessionmaker):
+    async with sessionmaker() as session:
+        repository = DepartmentRepository(session)
+
+        async with repository.unit_of_work():
+            await repository.create(Department(name='dep1'))
+            async with repository.unit_of_work():
+                await repository.create(Department(name='dep2'))
+            assert await names(sessionmaker) == []
+
+    assert await names(sessionmaker) == ['dep1', 'dep2']
+
+
+async def test_rollback_on_error(sessionmaker):
+    async with sessionmaker() as session:
+        repository = DepartmentRepository(session)
+
+        with pytest.raises(ValueError):
+            async with repository.unit_of_work():
+                await repository.create(Department(name='dep1'))
+                raise ValueError
+
+    assert await names(sessionmaker) == []
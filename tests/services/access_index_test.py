@@ -0,0 +1,83 @@
+from datetime import date
+from typing import NamedTuple
+
+from services.access_index import AccessIndex
+
+
+class Decision(NamedTuple):
+    employee_id: int = 1
+    card_start_date: date = date.today()
+    card_finish_date: date = date.today()
+    device_id: int | None = 1
+    opened: bool | None = False
+    department_id: int | None = 1
+    route: str | None = 'enter'
+    allowed: bool = True
+
+
+def test_put_and_get_decision():
+    index = AccessIndex()
+    index.put_decision(11111111, '111111qwerty', Decision(), index.generation)
+    index.put_decision(11111111, '222222qwerty', Decision(device_id=2, allowed=False), index.generation)
+
+    card = index.get_card(11111111)
+
+    assert card.employee_id == 1
+    assert card.card_finish_date == date.today()
+    assert card.devices == {1}
+    assert card.denied == {2}
+    assert index.get_device('222222qwerty') == (2, False, 1, 'enter')
+
+
+def test_unknown_device_is_not_stored():
+    index = AccessIndex()
+
+    decision = Decision(device_id=None, opened=None, department_id=None, route=None, allowed=False)
+    card, device = index.put_decision(11111111, 'unknown', decision, index.generation)
+
+    assert device is None
+    assert card.devices == card.denied == set()
+    assert index.get_device('unknown') is None
+
+
+def test_stale_decision_is_not_stored():
+    index = AccessIndex()
+    generation = index.generation
+    index.revoke(1, 1)
+
+    card, device = index.put_decision(11111111, '111111qwerty', Decision(), generation)
+
+    assert card.devices == {1}
+    assert index.get_card(11111111) is None
+    assert index.get_device('111111qwerty') is None
+
+
+def test_grant_and_revoke():
+    index = AccessIndex()
+    index.put_decision(11111111, '111111qwerty', Decision(), index.generation)
+
+    index.grant(1, 2)
+    assert index.get_card(11111111).devices == {1, 2}
+
+    index.revoke(1, 1)
+    assert index.get_card(11111111).devices == {2}
+    assert index.get_card(11111111).denied == {1}
+
+
+def test_discard_employee():
+    index = AccessIndex()
+    index.put_decision(11111111, '111111qwerty', Decision(), index.generation)
+
+    index.discard_employee(1)
+
+    assert index.get_card(11111111) is None
+
+
+def test_discard_device():
+    index = AccessIndex()
+    index.put_decision(11111111, '111111qwerty', Decision(), index.generation)
+
+    index.discard_device('111111qwerty', 1)
+
+    assert index.get_device('111111qwerty') is None
+    assert index.get_card(11111111).devices == set()
@@ -0,0 +1,42 @@
+from io import BytesIO
+import pytest
+from fastapi import UploadFile
+
+from services.employee_import import BLOCK_SIZE, read_csv
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_read_csv_quoted_newlines():
+    file = UploadFile(BytesIO(
+        b'name,surname\r\n'
+        b'"Leo\r\nNikolayevich",Tolstoy\r\n'
+        b'Anton,"Pavlovich ""Chekhov"""\r\n'
+        b'Ivan\r\n'
+        b'Ivan,Tur"genev\r\n'
+        b'\r\n'
+        b'Maxim,Gorky\r\n'
+    ), filename='employees.csv')
+
+    rows = [row async for row in read_csv(file, batch_size=2)]
+
+    assert rows == [
+        (2, {'name': 'Leo\r\nNikolayevich', 'surname': 'Tolstoy'}, None),
+        (4, {'name': 'Anton', 'surname': 'Pavlovich "Chekhov"'}, None),
+        (5, None, 'Expected 2 columns, got 1'),
+        (6, {'name': 'Ivan', 'surname': 'Tur"genev'}, None),
+        (8, {'name': 'Maxim', 'surname': 'Gorky'}, None),
+    ]
+
+
+async def test_read_csv_field_size_limit():
+    file = UploadFile(BytesIO(
+        b'name,surname\n'
+        b'Leo,' + b'x' * (BLOCK_SIZE + 1) + b'\n'
+        b'Maxim,Gorky\n'
+    ), filename='employees.csv')
+
+    rows = [row async for row in read_csv(file)]
+
+    assert rows[0][0] == 2 and rows[0][1] is None and 'field limit' in rows[0][2]
+    assert rows[1:] == [(3, {'name': 'Maxim', 'surname': 'Gorky'}, None)]
@@ -126,4 +126,30 @@ async def test_error_delete(fake_employee_repository, fake_department_repository
     with pytest.raises(HTTPException) as excinfo:
         await (EmployeeService(fake_employee_repository, fake_department_repository).delete(100))
 
-    assert excinfo.type is HTTPException
\ No newline at end of file
+    assert excinfo.type is HTTPException
+
+
+async def test_import_rows(empty_employee_repository, fake_department_repository):
+
+    async def rows():
+        today = date.today().isoformat()
+        yield 2, {'name': 'Leo', 'surname': 'Tolstoy', 'department_id': 1, 'card_id': 10101,
+                  'card_start_date': today, 'card_finish_date': today}, None
+        yield 3, None, 'Invalid JSON'
+        yield 4, {'name': 'Ivan', 'surname': 'Turgenev', 'department_id': 100, 'card_id': 10102,
+                  'card_start_date': today, 'card_finish_date': today}, None
+        yield 5, {'name': 'Anna', 'surname': 'Karenina', 'department_id': 1, 'card_id': 10101,
+                  'card_start_date': today, 'card_finish_date': today}, None
+        yield 6, {'name': 'Nikolai', 'surname': 'Gogol', 'department_id': 3, 'card_id': 10103,
+                  'card_start_date': today, 'card_finish_date': today}, None
+        yield 7, {'name': 'Nikolai', 'department_id': 3, 'card_id': 'x'}, None
+
+    report = await (EmployeeService(empty_employee_repository, fake_department_repository)
+                    .import_rows(rows(), chunk_size=2))
+
+    assert report['imported'] == 2
+    assert report['failed'] == 4
+    assert [error['line'] for error in report['errors']] == [3, 4, 5, 7]
+    assert report['errors'][2]['errors'] == ['Employee with card_id:10101 already exist.']
+    assert len(report['errors'][3]['errors']) == 4
+    assert [employee.card_id for employee in empty_employee_repository.items] == [10101, 10103]
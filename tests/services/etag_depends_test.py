@@ -0,0 +1,24 @@
+from datetime import date
+
+import pytest
+
+from core.etag_depends import matches
+from schemas.employee_schema import EmployeeSchema
+from services import EmployeeService
+
+
+def test_matches():
+    assert matches('"a", W/"b"', '"b"')
+    assert matches('*', '"b"')
+    assert not matches('"a"', '"b"')
+
+
+@pytest.mark.anyio
+async def test_create_bumps_version(fake_employee_repository, fake_department_repository):
+    bumped = len(fake_employee_repository.bumped_versions)
+
+    await EmployeeService(fake_employee_repository, fake_department_repository).create(EmployeeSchema(
+        name='Ivan', surname='Krylov', department_id=fake_department_repository.items[0].id, card_id=4444444,
+        card_start_date=date.today(), card_finish_date=date.today()))
+
+    assert fake_employee_repository.bumped_versions[bumped:] == ["employees"]
@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+
+from core import metrics
+from models import Event
+from services.event_journal import EventJournal
+
+pytestmark = pytest.mark.anyio
+
+
+class Writer:
+
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, events):
+        self.batches.append(list(events))
+
+
+async def test_flush_when_batch_is_full():
+    writer = Writer()
+    journal = EventJournal(writer, batch_size=2, flush_interval_ms=10_000, queue_size=10)
+    await journal.start()
+
+    for i in range(2):
+        await journal.put(Event(employee_id=i, success=True))
+    await asyncio.sleep(0.01)
+
+    assert [len(batch) for batch in writer.batches] == [2]
+    await journal.stop()
+
+
+async def test_flush_after_interval():
+    writer = Writer()
+    journal = EventJournal(writer, batch_size=100, flush_interval_ms=10, queue_size=10)
+    await journal.start()
+
+    await journal.put(Event(employee_id=1, success=True))
+    await asyncio.sleep(0.05)
+
+    assert [len(batch) for batch in writer.batches] == [1]
+    await journal.stop()
+
+
+async def test_stop_flushes_remaining_events():
+    writer = Writer()
+    journal = EventJournal(writer, batch_size=100, flush_interval_ms=10_000, queue_size=10)
+    await journal.start()
+
+    for i in range(3):
+        await journal.put(Event(employee_id=i, success=True))
+    await journal.stop()
+
+    assert not journal.running
+    assert [event.employee_id for batch in writer.batches for event in batch] == [0, 1, 2]
+
+
+class FlakyWriter(Writer):
+
+    def __init__(self, failures, bad_employee_id=None):
+        super().__init__()
+        self.failures = failures
+        self.bad_employee_id = bad_employee_id
+
+    async def __call__(self, events):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        if any(event.employee_id == self.bad_employee_id for event in events):
+            raise RuntimeError("bad event")
+        await super().__call__(events)
+
+
+async def test_failed_batch_is_retried():
+    writer = FlakyWriter(failures=2)
+    journal = EventJournal(writer, batch_size=100, flush_interval_ms=10_000, queue_size=10,
+                           retries=2, retry_backoff_ms=1)
+    dropped = metrics.event_journal_dropped.value
+    await journal.start()
+
+    for i in range(3):
+        await journal.put(Event(employee_id=i, success=True))
+    await journal.stop()
+
+    assert [[event.employee_id for event in batch] for batch in writer.batches] == [[0, 1, 2]]
+    assert metrics.event_journal_dropped.value == dropped
+
+
+async def test_only_bad_events_are_dropped():
+    writer = FlakyWriter(failures=0, bad_employee_id=1)
+    journal = EventJournal(writer, batch_size=100, flush_interval_ms=10_000, queue_size=10,
+                           retries=1, retry_backoff_ms=1)
+    dropped = metrics.event_journal_dropped.value
+    await journal.start()
+
+    for i in range(3):
+        await journal.put(Event(employee_id=i, success=True))
+    await journal.stop()
+
+    assert [event.employee_id for batch in writer.batches for event in batch] == [0, 2]
+    assert metrics.event_journal_dropped.value == dropped + 1
@@ -1,7 +1,10 @@
+from datetime import datetime, timedelta
 import pytest
 
 from schemas.device_schema import DeviceEmployeePostRequestSchema
+from schemas.event_schema import DropInSchema
 from services import EventService, DeviceService
+from services.occupancy import occupancy
 
 pytestmark = pytest.mark.anyio
 
@@ -61,4 +64,82 @@ async def test_create(
     assert retrieved is None
 
 
+async def test_check_entry_possibility_uses_access_index(
+        fake_event_repository,
+        fake_employee_repository,
+        fake_device_repository,
+        monkeypatch
+):
+
+    first_device = fake_device_repository.items[0]
+    first_employee = fake_employee_repository.items[0]
+    event = EventService(fake_device_repository, fake_event_repository, fake_employee_repository)
+
+    first_answer = await event.check_entry_possibility(first_employee.card_id, first_device.imei)
+
+    async def fail(*args, **kwargs):
+        raise AssertionError('database must not be queried')
+
+    monkeypatch.setattr(fake_employee_repository, 'get_access_decision', fail)
+
+    assert await event.check_entry_possibility(first_employee.card_id, first_device.imei) == first_answer
+
+
+async def test_check_entry_possibility_batch(
+        fake_event_repository,
+        fake_employee_repository,
+        fake_device_repository,
+        fake_department_repository
+):
+
+    last_device = fake_device_repository.items[-1]
+    last_employee = fake_employee_repository.items[-1]
+    await (DeviceService(fake_device_repository, fake_department_repository, fake_employee_repository)
+           .add_employee(DeviceEmployeePostRequestSchema(device_id=last_device.id, employee_id=last_employee.id)))
+
+    now = datetime.now()
+    swipes = [
+        DropInSchema(card_id=last_employee.card_id, imei=last_device.imei, created_date=now),
+        DropInSchema(card_id=last_employee.card_id, imei=fake_device_repository.items[1].imei, created_date=now),
+        DropInSchema(card_id=1, imei=last_device.imei, created_date=now),
+        DropInSchema(card_id=last_employee.card_id, imei=last_device.imei, created_date=now + timedelta(days=1)),
+    ]
+    number_of_events = len(fake_event_repository.items)
+
+    event = EventService(fake_device_repository, fake_event_repository, fake_employee_repository)
+    retrieved = await event.check_entry_possibility_batch(swipes)
+
+    assert [result['entry'] for result in retrieved] == [
+        'Admission are permitted',
+        'Admission are prohibited',
+        'Admission are prohibited',
+        'Admission are prohibited',
+    ]
+    created_events = fake_event_repository.items[number_of_events:]
+    assert [(e.employee_id, e.device_id) for e in created_events] == [
+        (last_employee.id, last_device.id),
+        (last_employee.id, fake_device_repository.items[1].id),
+        (None, None),
+        (last_employee.id, None),
+    ]
+    assert [e.created_date for e in created_events] == [swipe.created_date for swipe in swipes]
+
+
+async def test_failed_write_leaves_occupancy_alone(
+        fake_employee_repository,
+        fake_device_repository,
+        fake_event_repository,
+        monkeypatch
+):
+
+    async def failing_create(event):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(fake_event_repository, "create", failing_create)
+    event = EventService(fake_device_repository, fake_event_repository, fake_employee_repository)
+    data = event.EntryPossibility(success=True, employee_id=1, device_id=1, department_id=1, route='enter')
+
+    with pytest.raises(RuntimeError):
+        await event.create(data)
 
+    assert occupancy.site() == set()
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from services.hashing_pool import HashingPool
+from services.user_service import HashingMixin
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_run():
+    pool = HashingPool(max_workers=1, queue_size=1, executor="thread")
+
+    hashed_password = await pool.run(HashingMixin.get_password_hash, 'password')
+
+    assert await pool.run(HashingMixin.verify_password, 'password', hashed_password)
+    assert pool.pending == 0
+    pool.shutdown()
+
+
+async def test_queue_limit():
+    pool = HashingPool(max_workers=1, queue_size=1, executor="thread")
+    release = threading.Event()
+    running = [asyncio.create_task(pool.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await pool.run(release.wait)
+
+    release.set()
+    await asyncio.gather(*running)
+    assert excinfo.value.status_code == 503
+    pool.shutdown()
+
+
+def test_unknown_executor():
+    with pytest.raises(ValueError):
+        HashingPool(executor="fiber")
+
+
+async def test_run_on_processes():
+    pool = HashingPool(max_workers=1, queue_size=1, executor="process")
+    pool.start()
+
+    assert pool._executor._mp_context.get_start_method() == "forkserver"
+    assert HashingMixin.verify_password('password', await pool.run(HashingMixin.get_password_hash, 'password'))
+    pool.shutdown()
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+from services.occupancy import Occupancy
+
+now = datetime.now()
+
+
+def test_enter_and_exit():
+    occupancy = Occupancy()
+
+    occupancy.record(1, 1, 'enter', now)
+    occupancy.record(2, 1, 'enter', now)
+    occupancy.record(1, 2, 'enter', now)
+
+    assert occupancy.site() == {1, 2}
+    assert occupancy.department(1) == {1, 2}
+    assert occupancy.counts() == {1: 2, 2: 1}
+
+    occupancy.record(1, 1, 'exit', now + timedelta(minutes=1))
+
+    assert occupancy.site() == {1, 2}
+    assert occupancy.department(1) == {2}
+
+    occupancy.record(1, 2, 'exit', now + timedelta(minutes=1))
+
+    assert occupancy.site() == {2}
+    assert occupancy.counts() == {1: 1}
+
+
+def test_older_swipe_is_ignored():
+    occupancy = Occupancy()
+
+    occupancy.record(1, 1, 'exit', now)
+    occupancy.record(1, 1, 'enter', now - timedelta(hours=1))
+
+    assert occupancy.site() == set()
+
+
+def test_forget():
+    occupancy = Occupancy()
+    occupancy.record(1, 1, 'enter', now)
+
+    occupancy.forget(1)
+
+    assert occupancy.site() == set()
+    assert occupancy.department(1) == set()
+
+
+def test_load():
+    occupancy = Occupancy()
+    occupancy.record(3, 1, 'enter', now)
+
+    occupancy.load([(1, 1, 'enter', now), (2, 1, 'exit', now), (1, 2, 'enter', now)])
+
+    assert occupancy.site() == {1}
+    assert occupancy.counts() == {1: 1, 2: 1}
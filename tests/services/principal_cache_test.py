@@ -0,0 +1,65 @@
+import time
+
+from models import User
+from services.principal_cache import PrincipalCache
+
+
+def test_put_and_get():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    user = User(id=1, email='user1@gmail.com')
+
+    cache.put('token', user, 60)
+
+    assert cache.get('token') is user
+    assert cache.get('other') is None
+
+
+def test_entry_expires(monkeypatch):
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.put('short', User(id=1), 5)
+    cache.put('long', User(id=2), 3600)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 30)
+
+    assert cache.get('short') is None
+    assert cache.get('long') is not None
+
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 61)
+
+    assert cache.get('long') is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = PrincipalCache(max_size=2, ttl_seconds=60)
+    cache.put('token1', User(id=1), 60)
+    cache.put('token2', User(id=2), 60)
+    cache.get('token1')
+
+    cache.put('token3', User(id=3), 60)
+
+    assert cache.get('token2') is None
+    assert cache.get('token1') is not None
+    assert cache.get('token3') is not None
+
+
+def test_discard_user():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.put('token1', User(id=1), 60)
+    cache.put('token2', User(id=1), 60)
+    cache.put('token3', User(id=2), 60)
+
+    cache.discard_user(1)
+
+    assert cache.get('token1') is None
+    assert cache.get('token2') is None
+    assert cache.get('token3') is not None
+
+
+def test_disabled_cache():
+    cache = PrincipalCache(max_size=0, ttl_seconds=60)
+
+    cache.put('token', User(id=1), 60)
+
+    assert cache.get('token') is None
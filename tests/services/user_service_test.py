@@ -1,6 +1,7 @@
 import pytest
 from fastapi import HTTPException
 from services import UserService
+from services.principal_cache import principal_cache
 from schemas.user_schema import UserSchema, UpdateUserSchema
 
 pytestmark = pytest.mark.anyio
@@ -67,6 +68,16 @@ async def test_error_update(user_id, user_body, fake_user_repository,
     assert str(excinfo.value) == exception_value
 
 
+async def test_update_discards_cached_principal(fake_user_repository):
+
+    first_user = fake_user_repository.items[0]
+    principal_cache.put('token', first_user, 60)
+
+    await UserService(fake_user_repository).update(first_user.id, UpdateUserSchema(email='user1@gmail.com'))
+
+    assert principal_cache.get('token') is None
+
+
 async def test_create(fake_user_repository):
 
     new_user = UserSchema(email='new_user@gmail.com', password='new_user')
@@ -86,10 +97,12 @@ async def test_error_create(fake_user_repository):
 
 async def test_delete(fake_user_repository):
 
+    principal_cache.put('token', fake_user_repository.items[-1], 60)
     retrieved = await (UserService(fake_user_repository)
                        .delete(fake_user_repository.items[-1].id))
 
     assert retrieved is None
+    assert principal_cache.get('token') is None
 
 
 async def test_error_delete(fake_user_repository):